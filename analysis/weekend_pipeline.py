@@ -202,12 +202,18 @@ class WeekendAnalysisPipeline:
         
         results = []
         
+        # Batched download up front; symbols it misses are fetched
+        # (and validated) one by one in _analyze_single
+        histories = market_data.get_history_batch(
+            [c.get("symbol") for c in candidates], period="2y", cached=True
+        )
+        
         for i, candidate in enumerate(candidates):
             symbol = candidate.get("symbol")
             logger.info(f"[{i+1}/{len(candidates)}] Analyzing {symbol}...")
             
             try:
-                analysis = self._analyze_single(symbol, candidate)
+                analysis = self._analyze_single(symbol, candidate, histories.get(clean_symbol(symbol)))
                 if analysis:
                     results.append(analysis)
                     
@@ -225,8 +231,9 @@ class WeekendAnalysisPipeline:
         logger.info(f"Analysis complete: {len(results)} results")
         return results
     
-    def _analyze_single(self, symbol: str, candidate: Dict) -> Optional[Dict]:
-        """Analyze a single stock."""
+    def _analyze_single(self, symbol: str, candidate: Dict,
+                        hist: Optional[pd.DataFrame] = None) -> Optional[Dict]:
+        """Analyze a single stock (hist: prefetched 2y history, if any)."""
         
         # Validate symbol first
         symbol = clean_symbol(symbol)
@@ -235,7 +242,8 @@ class WeekendAnalysisPipeline:
             return None
         
         # Get historical data (2 years) using safe fetcher
-        hist = market_data.get_history(symbol, period="2y", validate=True)
+        if hist is None:
+            hist = market_data.get_history(symbol, period="2y", validate=True, cached=True)
         
         if hist is None or len(hist) < 200:
             logger.debug(f"{symbol}: Insufficient history or invalid symbol")
@@ -530,6 +538,9 @@ class WeekendAnalysisPipeline:
         if candidates:
             self.analyze_candidates(candidates)
         
+        # Step 4: JSON backup of the week's MongoDB snapshots
+        self.storage.export_backup()
+        
         logger.info("=" * 60)
         logger.info("PIPELINE COMPLETE")
         logger.info("=" * 60)
@@ -549,12 +560,15 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         cmd = sys.argv[1]
         
+        # Saves skip the JSON copy while MongoDB is up; back up after each step
         if cmd == "universe":
             pipeline.refresh_universe()
+            pipeline.storage.export_backup()
         elif cmd == "earnings":
             pipeline.get_earnings_candidates()
         elif cmd == "analyze":
             pipeline.analyze_candidates()
+            pipeline.storage.export_backup()
         elif cmd == "full":
             pipeline.run_full_pipeline()
         else:
@@ -22,8 +22,8 @@ def main():
     # Check Python version
     py_version = sys.version_info
     print(f"Python: {py_version.major}.{py_version.minor}.{py_version.micro}")
-    if py_version.major < 3 or (py_version.major == 3 and py_version.minor < 9):
-        errors.append("Python 3.9+ required")
+    if py_version.major < 3 or (py_version.major == 3 and py_version.minor < 10):
+        errors.append("Python 3.10+ required")
     
     # Check numpy (CRITICAL - must be <2.0)
     try:
@@ -18,8 +18,8 @@ def check_python_version():
     """Check Python version."""
     print("1. Checking Python version...")
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 9):
-        print(f"   ✗ Python 3.9+ required, got {version.major}.{version.minor}")
+    if version.major < 3 or (version.major == 3 and version.minor < 10):
+        print(f"   ✗ Python 3.10+ required, got {version.major}.{version.minor}")
         return False
     print(f"   ✓ Python {version.major}.{version.minor}.{version.micro}")
     return True
@@ -119,6 +119,17 @@ CONFIDENCE_THROTTLE = {
     "lookback_trades": 10,
 }
 
+# ============================================================
+# MARKET DATA
+# ============================================================
+# Accept-Encoding for our own Yahoo requests (spark validation; yfinance
+# uses its own session). "identity" = uncompressed
+MARKET_DATA_ENCODING = os.getenv("MARKET_DATA_ENCODING", "gzip, deflate")
+
+# Client-side Yahoo throttle (requests/sec, burst size)
+YAHOO_RATE_LIMIT = 5.0
+YAHOO_BURST = 10
+
 # ============================================================
 # LOGGING
 # ============================================================
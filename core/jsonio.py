@@ -0,0 +1,56 @@
+"""
+core/jsonio.py - Atomic JSON Files
+
+Shared by storage (snapshots, positions) and the T212 client
+(instrument cache). Standard library only, so importing it is cheap.
+"""
+
+import json
+import os
+import stat
+from pathlib import Path
+from typing import Any
+
+
+def write_json(filepath: Path, data: Any, indent: int = None):
+    """
+    Write JSON atomically: a temp file is fsync'd and renamed over filepath,
+    so a crash mid-write leaves the previous version intact.
+    
+    Compact by default: one dumps() call without indent uses the C encoder,
+    json.dump(indent=2) streams through the pure-Python one.
+    
+    The temp file is created 0666 & ~umask (unlike mkstemp's 0600) and
+    takes over filepath's mode if it exists, so rewrites keep permissions.
+    """
+    text = json.dumps(data, indent=indent)
+    tmp = filepath.with_name(f"{filepath.name}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            f = os.fdopen(fd, 'w')
+        except BaseException:
+            os.close(fd)
+            raise
+        with f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(filepath).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, filepath)
+    except BaseException:
+        # Don't let a failed cleanup hide the original error
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_json(filepath: Path) -> Any:
+    """Read a JSON file."""
+    with open(filepath) as f:
+        return json.load(f)
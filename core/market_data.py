@@ -10,10 +10,23 @@ Uses yfinance with:
 This fixes Yahoo Finance's anti-bot measures (late 2024/2025).
 """
 
+import atexit
 import logging
+import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from typing import Optional, Dict, Any, List
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable
 from datetime import timedelta
+from functools import lru_cache, wraps
+
+import config
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +37,41 @@ _session = None
 _yf = None
 _pd = None
 
+# Cache hit/miss counters, see get_cache_stats(). Bumped from worker
+# threads, so always through _count()
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(key: str):
+    """Increment a cache counter (Counter += is not atomic across threads)."""
+    with _stats_lock:
+        _stats[key] += 1
+
+# (connect, read) seconds, used when the caller doesn't pass a timeout
+_DEFAULT_TIMEOUT = (5, 15)
+
+
+def _make_adapter():
+    """
+    Pooled keep-alive adapter with default timeouts for our own session.
+    
+    Only covers requests made on _get_session() (spark validation);
+    yfinance >= 0.2.54 downloads through its own curl_cffi session.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    class _TimeoutAdapter(HTTPAdapter):
+        def send(self, request, timeout=None, **kwargs):
+            return super().send(request, timeout=timeout or _DEFAULT_TIMEOUT, **kwargs)
+    
+    # 5xx only: 429s are handled by the token bucket, retrying them
+    # here would just add load
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+    return _TimeoutAdapter(pool_maxsize=32, max_retries=retry)
+
+
 def _get_session():
     """Get or create cached session with browser headers."""
     global _session
@@ -56,6 +104,16 @@ def _get_session():
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
                 'AppleWebKit/537.36 Chrome/120.0.0.0'
             )
+        
+        # No Brotli: decoding it costs more CPU than gzip. Only requests
+        # made on this session see it (the spark validation endpoint);
+        # yfinance >= 0.2.54 rejects the session and uses its own.
+        # Set MARKET_DATA_ENCODING=identity to disable compression.
+        _session.headers['Accept-Encoding'] = config.MARKET_DATA_ENCODING
+        
+        # Keep-alive pool sized for the concurrent spark chunks, and a
+        # default timeout so a stalled socket can't hold a slot forever
+        _session.mount("https://", _make_adapter())
     
     return _session
 
@@ -65,6 +123,14 @@ def _get_yf():
     global _yf
     if _yf is None:
         import yfinance
+        
+        # yfinance keeps Yahoo's cookie + crumb in this folder. A stable,
+        # writable location lets restarts skip the fc.yahoo.com handshake.
+        try:
+            yfinance.set_tz_cache_location(str(config.DATA_DIR / "yfinance"))
+        except Exception as e:
+            logger.debug(f"Could not set yfinance cache location: {e}")
+        
         _yf = yfinance
     return _yf
 
@@ -78,13 +144,343 @@ def _get_pd():
     return _pd
 
 
+def _prewarm():
+    """Import yfinance/pandas off the hot path so the first fetch doesn't stall."""
+    try:
+        _get_pd()
+        _get_yf()
+    except Exception as e:
+        logger.debug(f"Market data prewarm failed: {e}")
+
+
+def prewarm():
+    """
+    Load yfinance/pandas in a background thread (called by main.py).
+    
+    A caller that beats the thread simply blocks on Python's import lock
+    until the import finishes. Not done at import time, so importing this
+    module never touches data/ or races the importer.
+    """
+    threading.Thread(target=_prewarm, name="market-data-prewarm", daemon=True).start()
+
+
+# ==================== TICKER CACHE ====================
+# yf.Ticker memoises fast_info/info/news per instance, so cached Tickers
+# expire on the same 1-minute horizon as the HTTP cache.
+
+_TICKER_TTL = 60
+_TICKER_MAX = 2048
+_tickers: OrderedDict = OrderedDict()  # symbol -> (Ticker, monotonic expiry)
+_tickers_lock = threading.Lock()
+
+
+_yf_accepts_session = True
+
+
+def _new_ticker(symbol: str):
+    """Create a yf.Ticker on the shared session if yfinance allows it."""
+    global _yf_accepts_session
+    yf = _get_yf()
+    
+    if _yf_accepts_session:
+        try:
+            return yf.Ticker(symbol, session=_get_session())
+        except Exception as e:
+            # Newer yfinance rejects caching/requests sessions outright
+            logger.info(f"yfinance rejected shared session, using its own: {e}")
+            _yf_accepts_session = False
+    
+    return yf.Ticker(symbol)
+
+
+def _ticker(symbol: str):
+    """
+    Get a (recently created) yf.Ticker bound to the shared session.
+    
+    Not for price reads: a Ticker keeps its FastInfo (and last price)
+    for its lifetime.
+    """
+    now = time.monotonic()
+    with _tickers_lock:
+        hit = _tickers.get(symbol)
+        if hit and hit[1] > now:
+            _tickers.move_to_end(symbol)
+            return hit[0]
+    
+    ticker = _new_ticker(symbol)
+    
+    with _tickers_lock:
+        _tickers[symbol] = (ticker, now + _TICKER_TTL)
+        _tickers.move_to_end(symbol)
+        if len(_tickers) > _TICKER_MAX:
+            _tickers.popitem(last=False)
+    
+    return ticker
+
+
+# ==================== RATE LIMITING ====================
+
+class _TokenBucket:
+    """
+    Client-side token bucket for Yahoo requests.
+    
+    Halves the fill rate when Yahoo returns 429 and recovers linearly
+    back to the configured rate (AIMD).
+    """
+    
+    def __init__(self, rate: float, capacity: float, recovery: float = 0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.recovery = recovery  # rate regained per second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.acquired = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self.updated
+                self.updated = now
+                self.rate = min(self.max_rate, self.rate + elapsed * self.recovery)
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            # Jitter so threads blocked together don't wake in lock-step
+            time.sleep(wait * (0.5 + random.random()))
+    
+    def throttled(self):
+        """Back off after a 429/503."""
+        with self._lock:
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self.tokens = 0
+
+
+_yahoo_bucket = _TokenBucket(config.YAHOO_RATE_LIMIT, config.YAHOO_BURST)
+
+
+_THROTTLE_STATUSES = (429, 503)
+
+
+def _check_throttled(error: Exception) -> bool:
+    """Slow the bucket down if an error was a Yahoo rate limit (429/503)."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    
+    if (type(error).__name__ == "YFRateLimitError"
+            or status in _THROTTLE_STATUSES
+            or "Too Many Requests" in str(error)):
+        logger.warning("Yahoo rate limit hit, slowing down requests")
+        _yahoo_bucket.throttled()
+        return True
+    
+    return False
+
+
+_TRANSIENT_ERRORS = {"ConnectionError", "Timeout", "TimeoutError"}
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    True for network/server errors that say nothing about the symbol.
+    
+    Connection errors, timeouts, 409/429 and 5xx responses (and Yahoo
+    rate limits) are transient; anything else (empty data, parse errors,
+    404s) is treated as a bad symbol.
+    """
+    if _check_throttled(error):
+        return True
+    
+    # By name, so requests' and curl_cffi's (yfinance's own session)
+    # exception hierarchies both match without importing either
+    if any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(error).__mro__):
+        return True
+    
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and (status in (409, 429) or status >= 500)
+
+
 # ==================== SYMBOL VALIDATION ====================
 
-# Cache of known symbols
-_bad_symbols: set = set()
-_good_symbols: set = set()
+class _TTLSet:
+    """
+    Thread-safe set with a size cap and per-entry expiry.
+    
+    Oldest entries are evicted past maxsize; expired entries are
+    dropped lazily on lookup.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float,
+                 on_add: Optional[Callable[[str, float], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_add = on_add  # called with (key, ttl) after each add
+        self._items: OrderedDict = OrderedDict()  # key -> monotonic expiry
+        self._lock = threading.Lock()
+    
+    def add(self, key: str, ttl: Optional[float] = None, notify: bool = True):
+        ttl = ttl or self.ttl
+        with self._lock:
+            self._items[key] = time.monotonic() + ttl
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        
+        if notify and self.on_add:
+            self.on_add(key, ttl)
+    
+    def discard(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expiry = self._items.get(key)
+            if expiry is None:
+                return False
+            if expiry < time.monotonic():
+                del self._items[key]
+                return False
+            return True
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _SymbolStore:
+    """
+    SQLite copy of the symbol caches so validity survives restarts.
+    
+    Writes are queued and flushed in one transaction every FLUSH_EVERY
+    symbols (and at exit), not one fsync per symbol. Expiry is stored
+    as wall-clock time since monotonic clocks reset with the process.
+    """
+    
+    FLUSH_EVERY = 50
+    
+    def __init__(self, path):
+        self.path = str(path)
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS sym ("
+            "symbol TEXT PRIMARY KEY, good INTEGER, expiry REAL)"
+        )
+    
+    def _execute(self, sql: str, rows: List[tuple] = None) -> List[tuple]:
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                if rows is not None:
+                    conn.executemany(sql, rows)
+                    return []
+                return conn.execute(sql).fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Symbol cache error ({self.path}): {e}")
+            return []
+    
+    def load_into(self, good: "_TTLSet", bad: "_TTLSet"):
+        """Restore entries that haven't expired yet (in-memory ones win)."""
+        now = time.time()
+        for symbol, is_good, expiry in self._execute("SELECT symbol, good, expiry FROM sym"):
+            if expiry > now and symbol not in good and symbol not in bad:
+                (good if is_good else bad).add(symbol, expiry - now, notify=False)
+    
+    def record(self, symbol: str, is_good: bool, ttl: float):
+        with self._lock:
+            self._pending[symbol] = (symbol, int(is_good), time.time() + ttl)
+            full = len(self._pending) >= self.FLUSH_EVERY
+        
+        if full:
+            self.flush()
+    
+    def flush(self):
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+        
+        if rows:
+            self._execute("INSERT OR REPLACE INTO sym VALUES (?, ?, ?)", rows)
+    
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+        self._execute("DELETE FROM sym")
 
 
+_symbol_store: Optional[_SymbolStore] = None
+_symbol_store_lock = threading.Lock()
+
+
+def _get_symbol_store() -> _SymbolStore:
+    """Lazy open the on-disk symbol cache and restore its entries."""
+    global _symbol_store
+    if _symbol_store is None:
+        with _symbol_store_lock:
+            if _symbol_store is None:
+                store = _SymbolStore(config.DATA_DIR / "symbol_cache.sqlite")
+                store.load_into(_good_symbols, _bad_symbols)
+                atexit.register(store.flush)
+                _symbol_store = store
+    return _symbol_store
+
+
+# Cache of known symbols (bad ones expire sooner so Yahoo blips recover)
+_bad_symbols = _TTLSet(
+    maxsize=4096, ttl=15 * 60,
+    on_add=lambda s, ttl: _get_symbol_store().record(s, False, ttl)
+)
+_good_symbols = _TTLSet(
+    maxsize=4096, ttl=24 * 3600,
+    on_add=lambda s, ttl: _get_symbol_store().record(s, True, ttl)
+)
+
+
+def clear_cache():
+    """Forget all known good/bad symbols (in memory and on disk)."""
+    _bad_symbols.clear()
+    _good_symbols.clear()
+    _get_symbol_store().clear()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Cache hit/miss counters since startup, plus current cache sizes.
+    
+    Useful for tuning TTLs: a low quote_cache_hit rate means the TTL is
+    shorter than the polling interval.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update({
+        "good_symbols": len(_good_symbols),
+        "bad_symbols": len(_bad_symbols),
+        "quote_cache": len(_price_cache),
+        "info_cache": len(_info_cache),
+        "tickers": len(_tickers),
+        "yahoo_requests": _yahoo_bucket.acquired,
+        "yahoo_rate": round(_yahoo_bucket.rate, 2),
+    })
+    return stats
+
+
+# Letter first, then up to 4 letters/digits/hyphens
+_SYMBOL_RE = re.compile(r"[A-Z][A-Z0-9-]{0,4}")
+
+
+@lru_cache(maxsize=8192)
 def clean_symbol(symbol: str) -> str:
     """Clean and validate a symbol string."""
     if not symbol:
@@ -94,13 +490,7 @@ def clean_symbol(symbol: str) -> str:
     symbol = symbol.replace("$", "").strip().upper()
     
     # Skip invalid symbols
-    if symbol and symbol[0].isdigit():
-        return ""
-    
-    if len(symbol) > 5:
-        return ""
-    
-    if not all(c.isalnum() or c == '-' for c in symbol):
+    if not _SYMBOL_RE.fullmatch(symbol):
         return ""
     
     return symbol
@@ -113,16 +503,28 @@ def is_valid_symbol(symbol: str) -> bool:
     if not symbol:
         return False
     
+    return _is_valid_cleaned(symbol)
+
+
+def _is_valid_cleaned(symbol: str) -> bool:
+    """is_valid_symbol for a symbol that is already cleaned."""
+    _get_symbol_store()
     if symbol in _bad_symbols:
+        _count("bad_hit")
         return False
     
     if symbol in _good_symbols:
+        _count("good_hit")
         return True
     
+    return _single_flight(("valid", symbol), lambda: _fetch_validity(symbol))
+
+
+def _fetch_validity(symbol: str) -> bool:
+    """Check a cleaned, uncached symbol against Yahoo and cache the answer."""
     try:
-        yf = _get_yf()
-        session = _get_session()
-        ticker = yf.Ticker(symbol, session=session)
+        _yahoo_bucket.acquire()
+        ticker = _ticker(symbol)
         
         # Try fast_info first (faster)
         price = ticker.fast_info.get('lastPrice')
@@ -140,24 +542,281 @@ def is_valid_symbol(symbol: str) -> bool:
         return False
         
     except Exception as e:
+        # A network hiccup or rate limit says nothing about the symbol
+        if not _is_transient(e):
+            _bad_symbols.add(symbol)
         logger.debug(f"Symbol validation failed for {symbol}: {e}")
-        _bad_symbols.add(symbol)
         return False
 
 
+_SPARK_URL = "https://query1.finance.yahoo.com/v7/finance/spark"
+_SPARK_CHUNK = 20
+
+
+def _spark_validate(symbols: List[str]) -> Dict[str, bool]:
+    """
+    Validate up to _SPARK_CHUNK cleaned symbols with one spark request.
+    
+    Returns {symbol: has_close_data}. Symbols are omitted if the request
+    failed, so callers can fall back to per-symbol validation.
+    """
+    try:
+        _yahoo_bucket.acquire()
+        resp = _get_session().get(_SPARK_URL, params={
+            "symbols": ",".join(symbols),
+            "range": "5d",
+            "interval": "1d",
+            "indicators": "close",
+        })
+        resp.raise_for_status()
+        results = (resp.json().get("spark") or {}).get("result") or []
+    except Exception as e:
+        _check_throttled(e)
+        logger.debug(f"Spark validation failed for {len(symbols)} symbols: {e}")
+        return {}
+    
+    found = {}
+    for entry in results:
+        symbol = entry.get("symbol", "").upper()
+        try:
+            closes = entry["response"][0]["indicators"]["quote"][0]["close"]
+            found[symbol] = any(c is not None for c in closes)
+        except (KeyError, IndexError, TypeError):
+            found[symbol] = False
+    
+    # Symbols Yahoo didn't echo back at all are unknown to it
+    return {s: found.get(s, False) for s in symbols} if results else {}
+
+
+def batch_validate(symbols: List[str]) -> List[str]:
+    """
+    Validate many symbols, returning the valid (cleaned, de-duplicated) ones.
+    
+    Uses cached results first, then one spark request per chunk of
+    unknown symbols; is_valid_symbol is the fallback if a chunk fails.
+    Chunks and fallbacks run on the fetch pool, paced by the token bucket.
+    """
+    _get_symbol_store()
+    cleaned = []
+    unknown = []
+    seen = set()
+    
+    for s in symbols:
+        symbol = clean_symbol(s)
+        if not symbol or symbol in seen:
+            continue
+        seen.add(symbol)
+        if symbol in _bad_symbols:
+            _count("bad_hit")
+            continue
+        cleaned.append(symbol)
+        if symbol in _good_symbols:
+            _count("good_hit")
+        else:
+            unknown.append(symbol)
+    
+    chunks = [unknown[i:i + _SPARK_CHUNK] for i in range(0, len(unknown), _SPARK_CHUNK)]
+    results = {}
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(chunks))) as pool:
+            for checked in pool.map(_spark_validate, chunks):
+                results.update(checked)
+    
+    for symbol, ok in results.items():
+        if ok:
+            _good_symbols.add(symbol)
+        else:
+            _bad_symbols.add(symbol)
+    
+    # Chunks whose spark request failed: check one by one
+    results.update(_fetch_many(_is_valid_cleaned, [s for s in unknown if s not in results]))
+    
+    return [s for s in cleaned if results.get(s, True)]
+
+
+# ==================== REQUEST COALESCING ====================
+# Concurrent callers asking for the same data share one Yahoo round-trip
+
+_inflight: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(key: tuple, fetch: Callable[[], Any]) -> Any:
+    """Run fetch() once per key; concurrent callers wait for its result."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+    
+    if not leader:
+        _count("coalesced")
+        return future.result()
+    
+    try:
+        result = fetch()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+# ==================== QUOTE CACHE ====================
+# Repeated reads within a loop tick are served from memory
+
+_PRICE_TTL = 2.0
+_INFO_TTL = 300.0
+_QUOTE_MAX = 4096
+_price_cache: Dict[str, tuple] = {}  # symbol -> (price, monotonic expiry)
+_info_cache: Dict[str, tuple] = {}   # symbol -> (info, monotonic expiry)
+
+
+def _cached(cache: Dict[str, tuple], name: str, symbol: str, ttl: float,
+            fetch: Callable[[], Any]) -> Any:
+    """Return a fresh cached value for symbol, or fetch and cache it (misses aren't cached)."""
+    now = time.monotonic()
+    hit = cache.get(symbol)
+    if hit and hit[1] > now:
+        _count(f"{name}_hit")
+        return hit[0]
+    
+    _count(f"{name}_miss")
+    value = fetch()
+    if value is not None:
+        if len(cache) >= _QUOTE_MAX:
+            for key in [k for k, (_, exp) in list(cache.items()) if exp <= now]:
+                cache.pop(key, None)
+        cache[symbol] = (value, time.monotonic() + ttl)
+    return value
+
+
+# ==================== HISTORY DISK CACHE ====================
+# Fetched history survives restarts; TTLs grow with the period since
+# long windows barely change between calls. Only weekend analysis opts
+# in (get_history(cached=True)): live checks need today's bar.
+
+_HISTORY_TTL = {
+    "1d": 60,
+    "5d": 300,
+    "1mo": 900,
+    "3mo": 3600,
+    "6mo": 3600,
+    "1y": 86400,
+    "2y": 86400,
+    "5y": 86400,
+}
+
+
+class _HistoryDiskCache:
+    """
+    One Parquet (zstd) file per (symbol, period, interval), fresh while
+    its mtime is within the period's TTL.
+    
+    Disabled without pyarrow; there is no pickle fallback, since loading
+    a pickle from data/ can run arbitrary code.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.enabled: Optional[bool] = None  # pyarrow is probed on first use
+    
+    def _file(self, symbol: str, period: str, interval: str):
+        if self.path is None or period not in _HISTORY_TTL or interval != "1d":
+            return None
+        
+        if self.enabled is None:
+            try:
+                import pyarrow  # noqa: F401
+                self.enabled = True
+            except ImportError:
+                logger.debug("pyarrow not installed, history disk cache disabled")
+                self.enabled = False
+        if not self.enabled:
+            return None
+        
+        return self.path / f"{symbol}_{period}_{interval}.parquet"
+    
+    def load(self, symbol: str, period: str, interval: str) -> Optional[Any]:
+        """Return the cached DataFrame if present and fresh."""
+        file = self._file(symbol, period, interval)
+        if file is None:
+            return None
+        
+        try:
+            if time.time() - file.stat().st_mtime >= _HISTORY_TTL[period]:
+                return None
+            return _get_pd().read_parquet(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Could not read cached history {file.name}: {e}")
+            return None
+    
+    def save(self, symbol: str, period: str, interval: str, df):
+        """Write df atomically, so readers never see a partial file."""
+        file = self._file(symbol, period, interval)
+        if file is None:
+            return
+        
+        tmp = file.with_name(f"{file.name}.{threading.get_ident()}.tmp")
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp, compression="zstd")
+            os.replace(tmp, file)
+        except Exception as e:
+            logger.debug(f"Could not cache history {file.name}: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+_history_disk = _HistoryDiskCache(config.DATA_DIR / "history")
+
+
 # ==================== PRICE DATA ====================
 
+def _symbol_guard(empty: Callable[[], Any] = lambda: None):
+    """
+    Clean the symbol argument before calling the wrapped fetcher.
+    
+    Invalid or blacklisted symbols return empty() without touching
+    the network. The wrapped function always receives a cleaned symbol.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(symbol: str, *args, **kwargs):
+            symbol = clean_symbol(symbol)
+            if not symbol:
+                return empty()
+            _get_symbol_store()
+            if symbol in _bad_symbols:
+                _count("bad_hit")
+                return empty()
+            return fn(symbol, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@_symbol_guard()
 def get_current_price(symbol: str) -> Optional[float]:
     """Get current price for a symbol."""
-    symbol = clean_symbol(symbol)
-    
-    if not symbol or symbol in _bad_symbols:
-        return None
-    
+    return _cached(_price_cache, "quote_cache", symbol, _PRICE_TTL, lambda: _single_flight(
+        ("price", symbol), lambda: _fetch_current_price(symbol)
+    ))
+
+
+def _fetch_current_price(symbol: str) -> Optional[float]:
+    """Fetch current price for a cleaned symbol."""
     try:
-        yf = _get_yf()
-        session = _get_session()
-        ticker = yf.Ticker(symbol, session=session)
+        _yahoo_bucket.acquire()
+        # Fresh Ticker: a cached one would serve its memoized lastPrice
+        ticker = _new_ticker(symbol)
         
         # Try fast_info first (much faster)
         try:
@@ -168,20 +827,25 @@ def get_current_price(symbol: str) -> Optional[float]:
         except Exception:
             pass
         
-        # Fallback to history
-        hist = ticker.history(period="1d", interval="1m")
+        # Fallback to today's daily bar (its Close tracks the last trade,
+        # without pulling ~390 one-minute rows)
+        hist = ticker.history(period="1d")
         if hist is not None and not hist.empty:
+            closes = hist['Close'].to_numpy()
             _good_symbols.add(symbol)
-            return float(hist['Close'].iloc[-1])
+            return float(closes[-1])
         
         return None
         
     except Exception as e:
+        _check_throttled(e)
         logger.debug(f"Error getting price for {symbol}: {e}")
         return None
 
 
-def get_history(symbol: str, period: str = "1mo", interval: str = "1d") -> Optional[Any]:
+@_symbol_guard()
+def get_history(symbol: str, period: str = "1mo", interval: str = "1d",
+                validate: bool = False, cached: bool = False) -> Optional[Any]:
     """
     Get historical OHLCV data.
     
@@ -189,21 +853,47 @@ def get_history(symbol: str, period: str = "1mo", interval: str = "1d") -> Optio
         symbol: Stock symbol
         period: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
         interval: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
+        validate: Check the symbol with is_valid_symbol first
+        cached: Use the on-disk history cache (weekend analysis only;
+            its data can be hours old, so live checks leave this off)
     
     Returns:
         DataFrame or None
     """
-    symbol = clean_symbol(symbol)
-    
-    if not symbol or symbol in _bad_symbols:
+    if validate and not _is_valid_cleaned(symbol):
         return None
     
+    if not cached:
+        return _single_flight(
+            ("history", symbol, period, interval),
+            lambda: _fetch_history(symbol, period, interval)
+        )
+    
+    df = _history_disk.load(symbol, period, interval)
+    if df is not None:
+        _count("history_disk_hit")
+        return df
+    
+    return _single_flight(
+        ("history_cached", symbol, period, interval),
+        lambda: _fetch_and_store_history(symbol, period, interval)
+    )
+
+
+def _fetch_and_store_history(symbol: str, period: str, interval: str) -> Optional[Any]:
+    """Fetch history and write it to the disk cache."""
+    df = _fetch_history(symbol, period, interval)
+    if df is not None:
+        _history_disk.save(symbol, period, interval, df)
+    return df
+
+
+def _fetch_history(symbol: str, period: str, interval: str) -> Optional[Any]:
+    """Fetch OHLCV history for a cleaned symbol."""
     try:
-        yf = _get_yf()
+        _yahoo_bucket.acquire()
         pd = _get_pd()
-        session = _get_session()
-        
-        ticker = yf.Ticker(symbol, session=session)
+        ticker = _ticker(symbol)
         
         # repair=True fixes missing data points
         df = ticker.history(period=period, interval=interval, repair=True)
@@ -220,21 +910,69 @@ def get_history(symbol: str, period: str = "1mo", interval: str = "1d") -> Optio
         return df
         
     except Exception as e:
+        _check_throttled(e)
         logger.debug(f"Error getting history for {symbol}: {e}")
         return None
 
 
-def get_info(symbol: str) -> Optional[Dict]:
-    """Get company info."""
-    symbol = clean_symbol(symbol)
+@dataclass(frozen=True)
+class OHLCV:
+    """History as plain NumPy columns, for callers that only do array math."""
+    ts: Any       # datetime64 array, UTC (tz-naive)
+    open: Any
+    high: Any
+    low: Any
+    close: Any
+    volume: Any
+    
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+def get_history_arrays(symbol: str, period: str = "1mo", interval: str = "1d") -> Optional[OHLCV]:
+    """
+    Get historical OHLCV data as NumPy arrays.
+    
+    Same data (and request coalescing) as get_history, so indicator code
+    can skip Series overhead and per-indicator .values copies. Columns may
+    share memory with the DataFrame; treat them as read-only (under pandas
+    copy-on-write they are flagged non-writeable).
     
-    if not symbol or symbol in _bad_symbols:
+    yfinance returns an exchange-tz-aware index, which to_numpy() would
+    turn into an object array of Timestamps. ts is converted to UTC and
+    stripped of its tz instead, giving a datetime64 array.
+    """
+    df = get_history(symbol, period=period, interval=interval)
+    if df is None:
         return None
     
+    index = df.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_convert(None)
+    
+    return OHLCV(
+        ts=index.to_numpy(),
+        open=df["Open"].to_numpy(),
+        high=df["High"].to_numpy(),
+        low=df["Low"].to_numpy(),
+        close=df["Close"].to_numpy(),
+        volume=df["Volume"].to_numpy(),
+    )
+
+
+@_symbol_guard()
+def get_info(symbol: str) -> Optional[Dict]:
+    """Get company info."""
+    return _cached(_info_cache, "info_cache", symbol, _INFO_TTL, lambda: _single_flight(
+        ("info", symbol), lambda: _fetch_info(symbol)
+    ))
+
+
+def _fetch_info(symbol: str) -> Optional[Dict]:
+    """Fetch company info for a cleaned symbol."""
     try:
-        yf = _get_yf()
-        session = _get_session()
-        ticker = yf.Ticker(symbol, session=session)
+        _yahoo_bucket.acquire()
+        ticker = _ticker(symbol)
         
         info = ticker.info
         if info:
@@ -244,44 +982,47 @@ def get_info(symbol: str) -> Optional[Dict]:
         return None
         
     except Exception as e:
+        _check_throttled(e)
         logger.debug(f"Error getting info for {symbol}: {e}")
         return None
 
 
+@_symbol_guard(list)
 def get_news(symbol: str, max_items: int = 5) -> List[Dict]:
     """Get recent news for a symbol."""
-    symbol = clean_symbol(symbol)
-    
-    if not symbol or symbol in _bad_symbols:
-        return []
-    
+    news = _single_flight(("news", symbol), lambda: _fetch_news(symbol))
+    return news[:max_items]
+
+
+def _fetch_news(symbol: str) -> List[Dict]:
+    """Fetch all recent news for a cleaned symbol."""
     try:
-        yf = _get_yf()
-        session = _get_session()
-        ticker = yf.Ticker(symbol, session=session)
+        _yahoo_bucket.acquire()
+        ticker = _ticker(symbol)
         
         news = ticker.news
         if news:
-            return news[:max_items]
+            return news
         
         return []
         
     except Exception as e:
+        _check_throttled(e)
         logger.debug(f"Error getting news for {symbol}: {e}")
         return []
 
 
+@_symbol_guard()
 def get_earnings_dates(symbol: str) -> Optional[Any]:
     """Get earnings dates."""
-    symbol = clean_symbol(symbol)
-    
-    if not symbol or symbol in _bad_symbols:
-        return None
-    
+    return _single_flight(("earnings", symbol), lambda: _fetch_earnings_dates(symbol))
+
+
+def _fetch_earnings_dates(symbol: str) -> Optional[Any]:
+    """Fetch earnings dates for a cleaned symbol."""
     try:
-        yf = _get_yf()
-        session = _get_session()
-        ticker = yf.Ticker(symbol, session=session)
+        _yahoo_bucket.acquire()
+        ticker = _ticker(symbol)
         
         earnings = ticker.earnings_dates
         if earnings is not None and not earnings.empty:
@@ -290,10 +1031,110 @@ def get_earnings_dates(symbol: str) -> Optional[Any]:
         return None
         
     except Exception as e:
+        _check_throttled(e)
         logger.debug(f"Error getting earnings dates for {symbol}: {e}")
         return None
 
 
+# ==================== MULTI-SYMBOL FETCHING ====================
+# Overlaps the per-symbol network waits; the token bucket still caps
+# the overall Yahoo request rate.
+
+_FETCH_WORKERS = 8
+
+
+def _fetch_many(fetch: Callable[[str], Any], symbols: List[str]) -> Dict[str, Any]:
+    """Run fetch(symbol) for each unique symbol on a small thread pool."""
+    unique = list(dict.fromkeys(symbols))
+    if not unique:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(unique))) as pool:
+        return dict(zip(unique, pool.map(fetch, unique)))
+
+
+# Symbols per yf.download call; each still costs Yahoo one request
+_BATCH_SIZE = config.YAHOO_BURST
+
+
+def get_history_batch(symbols: List[str], period: str = "1mo", interval: str = "1d",
+                      cached: bool = False) -> Dict[str, Any]:
+    """
+    Get history for many symbols through yf.download.
+    
+    yf.download still sends one request per ticker, so symbols go in
+    chunks of _BATCH_SIZE, each taking one token per symbol before the
+    chunk is downloaded on yfinance's threads.
+    
+    Returns {cleaned_symbol: DataFrame}; symbols without data are left
+    out, callers fall back to get_history for those. Frames have the same
+    adjusted OHLCV columns as get_history; cached works the same way.
+    """
+    _get_symbol_store()
+    cleaned = [
+        s for s in dict.fromkeys(clean_symbol(x) for x in symbols)
+        if s and s not in _bad_symbols
+    ]
+    
+    frames = {}
+    if cached:
+        for symbol in cleaned:
+            df = _history_disk.load(symbol, period, interval)
+            if df is not None:
+                _count("history_disk_hit")
+                frames[symbol] = df
+    
+    missing = [s for s in cleaned if s not in frames]
+    for i in range(0, len(missing), _BATCH_SIZE):
+        fetched = _download_chunk(missing[i:i + _BATCH_SIZE], period, interval)
+        if cached:
+            for symbol, df in fetched.items():
+                _history_disk.save(symbol, period, interval, df)
+        frames.update(fetched)
+    
+    return frames
+
+
+def _download_chunk(symbols: List[str], period: str, interval: str) -> Dict[str, Any]:
+    """One yf.download call for a few cleaned symbols ({symbol: DataFrame})."""
+    for _ in symbols:
+        _yahoo_bucket.acquire()
+    
+    try:
+        # repair/ignore_tz=False match Ticker.history, as get_history uses
+        data = _get_yf().download(
+            tickers=" ".join(symbols), period=period, interval=interval,
+            group_by="ticker", auto_adjust=True, repair=True, ignore_tz=False,
+            threads=True, progress=False
+        )
+    except Exception as e:
+        _check_throttled(e)
+        logger.debug(f"Batch download failed for {len(symbols)} symbols: {e}")
+        return {}
+    
+    if data is None or data.empty:
+        return {}
+    
+    multi = data.columns.nlevels > 1
+    frames = {}
+    for symbol in symbols:
+        if multi:
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            df = data[symbol].dropna(how="all")
+        else:
+            df = data.dropna(how="all")
+        
+        if not df.empty:
+            frames[symbol] = df
+            _good_symbols.add(symbol)
+    
+    # Missing symbols are not blacklisted: yf.download fills per-ticker
+    # failures (timeouts, rate limits) with NaN just like unknown tickers,
+    # so leave that call to is_valid_symbol
+    return frames
+
+
 # ==================== SAFE WRAPPERS (for compatibility) ====================
 
 def safe_get_price(symbol: str) -> Optional[float]:
@@ -14,13 +14,19 @@ Runs continuously during market hours.
 """
 
 import logging
+import re
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import pytz
 import requests
 
 import config
@@ -29,6 +35,61 @@ from core.telegram import Telegram
 
 logger = logging.getLogger(__name__)
 
+ET = pytz.timezone('US/Eastern')
+
+# Regular session, minutes since midnight ET
+_MARKET_OPEN_MIN = 9 * 60 + 30
+_MARKET_CLOSE_MIN = 16 * 60
+
+# Minutes after the open / before the close that always poll at full rate
+_BUSY_WINDOW_MIN = 15
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _news_id(symbol: str, headline: str) -> int:
+    """
+    Dedup key for a headline: symbol + first 30 characters.
+    
+    Kept as a 64-bit hash (in-process only) rather than the formatted
+    string, so the seen-news LRU holds small ints.
+    """
+    return hash((symbol, headline[:30]))
+
+
+_fmp_session: Optional[requests.Session] = None
+
+
+def _get_fmp_session() -> requests.Session:
+    """
+    Shared keep-alive session for FMP, so checks reuse TLS connections.
+    
+    With requests_cache installed, responses are kept in memory for just
+    under the check interval and revalidated with ETag/Last-Modified
+    after that, so unchanged feeds come back as a bodyless 304.
+    """
+    global _fmp_session
+    if _fmp_session is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        try:
+            import requests_cache
+            _fmp_session = requests_cache.CachedSession(
+                'fmp_news',
+                backend='memory',
+                expire_after=55,
+                cache_control=True,
+                stale_if_error=True,
+                ignored_parameters=['apikey'],
+            )
+        except ImportError:
+            _fmp_session = requests.Session()
+        
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        _fmp_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry))
+    return _fmp_session
+
 
 class NewsImpact(Enum):
     POSITIVE = "positive"
@@ -37,15 +98,17 @@ class NewsImpact(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsItem:
     symbol: str
     headline: str
     source: str
     timestamp: datetime
+    timestamp_epoch: float  # timestamp as POSIX seconds, for age checks
     url: str
-    impact: NewsImpact
-    keywords: List[str]
+    # Filled in by _fetch_news for items that survive filtering
+    impact: NewsImpact = NewsImpact.UNKNOWN
+    keywords: List[str] = field(default_factory=list)
 
 
 class NewsMonitor:
@@ -83,19 +146,48 @@ class NewsMonitor:
         "buyout", "takeover", "spin-off", "restructuring", "bankruptcy"
     ]
     
+    # Every keyword once, scanned in a single pass per headline. Material
+    # keywords come first so matches keep MATERIAL_KEYWORDS order.
+    _ALL_KEYWORDS = tuple(dict.fromkeys(MATERIAL_KEYWORDS + POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS))
+    _POSITIVE_SET = frozenset(POSITIVE_KEYWORDS)
+    _NEGATIVE_SET = frozenset(NEGATIVE_KEYWORDS)
+    _MATERIAL_SET = frozenset(MATERIAL_KEYWORDS)
+    
+    # Tickers per FMP news request (keeps the URL short and the limit useful)
+    FMP_CHUNK = 25
+    
+    # Seen news ids kept for dedup; the least recently seen are dropped
+    MAX_SEEN_NEWS = 50000
+    
+    # Headlines sharing this fraction of their words are the same story
+    NEAR_DUPLICATE = 0.75
+    
     def __init__(self):
         self.telegram = Telegram()
         
         # Track seen news to avoid duplicates
-        self._seen_news: Set[str] = set()
+        self._seen_news: OrderedDict = OrderedDict()  # _news_id -> None, LRU order
+        self._seen_lock = threading.Lock()
         self._news_cache: Dict[str, List[NewsItem]] = {}
-        self._last_check: Dict[str, datetime] = {}
+        self._last_check: Dict[str, float] = {}  # symbol -> time.monotonic()
         
-        # Watchlist (symbols to monitor)
+        # Checks in progress; concurrent callers for a symbol share one fetch
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # FMP fetches run here so they overlap the Yahoo fetch of the same check
+        self._fmp_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fmp-news")
+        
+        # Watchlist (symbols to monitor, upper-cased on entry)
         self._watchlist: Set[str] = set()
         
         # Check interval (seconds)
         self.check_interval = 60  # Check every minute during market hours
+        self.max_check_interval = 300  # Backoff cap when nothing material shows up
+        self._empty_cycles = 0
+        
+        # Symbols checked concurrently by check_watchlist
+        self.max_workers = 8
         
         # Running flag
         self._running = False
@@ -125,80 +217,182 @@ class NewsMonitor:
         Returns news from last hour.
         """
         symbol = symbol.upper()
-        news_items = []
         
-        # Rate limit: don't check same symbol more than once per minute
-        last = self._last_check.get(symbol)
-        if last and (datetime.now() - last).seconds < 60:
-            return self._news_cache.get(symbol, [])
+        with self._inflight_lock:
+            future = self._inflight.get(symbol)
+            leader = future is None
+            if leader:
+                # Rate limit: don't check same symbol more than once per minute
+                if not self._is_due(symbol):
+                    return self._news_cache.get(symbol, [])
+                
+                self._last_check[symbol] = time.monotonic()
+                future = Future()
+                self._inflight[symbol] = future
         
-        self._last_check[symbol] = datetime.now()
+        if not leader:
+            return future.result()
+        
+        return self._run_check(symbol, future)
+    
+    def _run_check(self, symbol: str, future: Future,
+                   prefetched: Optional[Future] = None) -> List[NewsItem]:
+        """Fetch as the symbol's leader, share the result and free the slot."""
+        try:
+            news = self._fetch_news(symbol, prefetched)
+            future.set_result(news)
+            return news
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(symbol, None)
+    
+    def check_news_many(self, symbols: List[str]) -> Dict[str, List[NewsItem]]:
+        """
+        check_news for many symbols at once ({symbol: news}).
+        
+        FMP is asked in bulk (one request per FMP_CHUNK tickers) in the
+        background while the per-symbol Yahoo fetches run concurrently;
+        market_data still rate-limits Yahoo.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        if not symbols:
+            return {}
+        
+        # Claim the due symbols up front, as check_news would. The bulk
+        # request marks its items seen, so each of its symbols must be
+        # fetched by the leader holding its result, never by a racing check.
+        claimed: Dict[str, Future] = {}
+        with self._inflight_lock:
+            for symbol in symbols:
+                if symbol not in self._inflight and self._is_due(symbol):
+                    self._last_check[symbol] = time.monotonic()
+                    claimed[symbol] = self._inflight[symbol] = Future()
+        
+        bulk = None
+        if config.FMP_API_KEY and claimed:
+            bulk = self._fmp_pool.submit(self._get_fmp_news_bulk, list(claimed))
+        
+        def check(symbol: str) -> List[NewsItem]:
+            future = claimed.get(symbol)
+            if future is None:
+                return self.check_news(symbol)
+            return self._run_check(symbol, future, bulk)
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as pool:
+            return dict(zip(symbols, pool.map(check, symbols)))
+    
+    def _fetch_news(self, symbol: str, prefetched: Optional[Future] = None) -> List[NewsItem]:
+        """
+        Fetch, filter and cache recent news for an upper-cased symbol.
+        
+        prefetched: check_news_many's bulk FMP fetch covering this symbol.
+        """
+        # Start FMP first (or join the watchlist's bulk fetch) so it runs
+        # alongside yfinance: max(t_yf, t_fmp) instead of the sum
+        fmp_future = None
+        if config.FMP_API_KEY and prefetched is None:
+            fmp_future = self._fmp_pool.submit(self._get_fmp_news, symbol)
         
         # Get from yfinance
-        yf_news = self._get_yfinance_news(symbol)
-        news_items.extend(yf_news)
+        news_items = self._get_yfinance_news(symbol)
         
-        # Get from FMP if configured
-        if config.FMP_API_KEY:
-            fmp_news = self._get_fmp_news(symbol)
-            news_items.extend(fmp_news)
+        # Get from FMP (symbols whose bulk request failed are retried alone)
+        if prefetched is not None:
+            fmp_news = prefetched.result().get(symbol)
+            news_items.extend(self._get_fmp_news(symbol) if fmp_news is None else fmp_news)
+        elif fmp_future is not None:
+            news_items.extend(fmp_future.result())
         
         # Filter to recent only (last 2 hours)
-        cutoff = datetime.now() - timedelta(hours=2)
-        recent = [n for n in news_items if n.timestamp > cutoff]
+        cutoff = time.time() - 2 * 3600
+        recent = [n for n in news_items if n.timestamp_epoch > cutoff]
         
-        # Deduplicate
+        # Deduplicate (same opening, or same story reworded by another source)
         unique = []
         seen_headlines = set()
+        seen_words: List[frozenset] = []
         for n in recent:
             headline_key = n.headline[:50].lower()
-            if headline_key not in seen_headlines:
-                seen_headlines.add(headline_key)
-                unique.append(n)
+            if headline_key in seen_headlines:
+                continue
+            
+            words = frozenset(_WORD_RE.findall(n.headline.lower()))
+            if any(self._is_near_duplicate(words, other) for other in seen_words):
+                continue
+            
+            seen_headlines.add(headline_key)
+            seen_words.append(words)
+            
+            # Classify only what survived the time filter and dedup
+            impact, keywords = self._analyze_headline(n.headline)
+            n.impact = impact
+            n.keywords = list(keywords)
+            unique.append(n)
         
         # Cache
         self._news_cache[symbol] = unique
         
         return unique
     
+    def _is_near_duplicate(self, a: frozenset, b: frozenset) -> bool:
+        """Word-set Jaccard similarity at or above NEAR_DUPLICATE."""
+        if not a or not b:
+            return False
+        return len(a & b) / len(a | b) >= self.NEAR_DUPLICATE
+    
+    def _mark_seen(self, news_ids: List[int]) -> List[bool]:
+        """Record a fetch's news ids as seen (one lock round); False where already seen."""
+        seen = self._seen_news
+        fresh = []
+        with self._seen_lock:
+            for news_id in news_ids:
+                if news_id in seen:
+                    seen.move_to_end(news_id)
+                    fresh.append(False)
+                else:
+                    seen[news_id] = None
+                    fresh.append(True)
+            
+            while len(seen) > self.MAX_SEEN_NEWS:
+                seen.popitem(last=False)
+        return fresh
+    
+    def _is_due(self, symbol: str) -> bool:
+        """True if symbol wasn't checked within the last minute."""
+        last = self._last_check.get(symbol)
+        return last is None or time.monotonic() - last >= 60
+    
     def _get_yfinance_news(self, symbol: str) -> List[NewsItem]:
-        """Get news from yfinance."""
+        """Get news from yfinance (unclassified, see _fetch_news)."""
         news_items = []
         
         try:
             raw_news = market_data.get_news(symbol, max_items=10)
             
-            for item in raw_news:
-                headline = item.get("title", "")
-                
+            # Interned: a story tagged with several tickers keeps one copy
+            headlines = [sys.intern(item.get("title") or "") for item in raw_news]
+            fresh = self._mark_seen([_news_id(symbol, h) for h in headlines])
+            
+            for item, headline, is_new in zip(raw_news, headlines, fresh):
                 # Skip if already seen
-                news_id = f"{symbol}:{headline[:30]}"
-                if news_id in self._seen_news:
+                if not is_new:
                     continue
                 
                 # Parse timestamp
-                pub_time = item.get("providerPublishTime", 0)
-                if pub_time:
-                    timestamp = datetime.fromtimestamp(pub_time)
-                else:
-                    timestamp = datetime.now()
-                
-                # Classify impact
-                impact = self._classify_impact(headline)
-                keywords = self._extract_keywords(headline)
+                epoch = float(item.get("providerPublishTime") or time.time())
                 
                 news_items.append(NewsItem(
                     symbol=symbol,
                     headline=headline,
-                    source=item.get("publisher", "Unknown"),
-                    timestamp=timestamp,
-                    url=item.get("link", ""),
-                    impact=impact,
-                    keywords=keywords
+                    source=sys.intern(item.get("publisher") or "Unknown"),
+                    timestamp=datetime.fromtimestamp(epoch),
+                    timestamp_epoch=epoch,
+                    url=item.get("link", "")
                 ))
                 
-                self._seen_news.add(news_id)
-                
         except Exception as e:
             logger.debug(f"yfinance news error for {symbol}: {e}")
         
@@ -206,28 +400,53 @@ class NewsMonitor:
     
     def _get_fmp_news(self, symbol: str) -> List[NewsItem]:
         """Get news from FMP API."""
-        news_items = []
+        return self._get_fmp_news_bulk([symbol]).get(symbol, [])
+    
+    def _get_fmp_news_bulk(self, symbols: List[str]) -> Dict[str, List[NewsItem]]:
+        """
+        Get FMP news for many symbols with one request per FMP_CHUNK tickers.
         
-        try:
-            url = f"https://financialmodelingprep.com/api/v3/stock_news"
-            params = {
-                "tickers": symbol,
-                "limit": 10,
-                "apikey": config.FMP_API_KEY
-            }
+        Returns {symbol: news}. Every symbol of a successful request gets an
+        entry (possibly empty); symbols of failed requests are left out.
+        Items are unclassified, see _fetch_news.
+        """
+        results: Dict[str, List[NewsItem]] = {}
+        
+        for i in range(0, len(symbols), self.FMP_CHUNK):
+            chunk = symbols[i:i + self.FMP_CHUNK]
             
-            resp = requests.get(url, params=params, timeout=10)
-            if resp.status_code != 200:
-                return []
+            try:
+                url = f"https://financialmodelingprep.com/api/v3/stock_news"
+                params = {
+                    "tickers": ",".join(chunk),
+                    "limit": 10 * len(chunk),
+                    "apikey": config.FMP_API_KEY
+                }
+                
+                resp = _get_fmp_session().get(url, params=params, timeout=(3, 7))
+                if resp.status_code != 200:
+                    continue
+                
+                data = resp.json()
+                
+            except Exception as e:
+                logger.debug(f"FMP news error for {','.join(chunk)}: {e}")
+                continue
             
-            data = resp.json()
+            for symbol in chunk:
+                results[symbol] = []
             
+            rows = []
             for item in data:
-                headline = item.get("title", "")
-                
+                symbol = (item.get("symbol") or "").upper()
+                if symbol in results:
+                    rows.append((item, symbol, sys.intern(item.get("title") or "")))
+            
+            fresh = self._mark_seen([_news_id(symbol, headline) for _, symbol, headline in rows])
+            
+            for (item, symbol, headline), is_new in zip(rows, fresh):
                 # Skip if seen
-                news_id = f"{symbol}:{headline[:30]}"
-                if news_id in self._seen_news:
+                if not is_new:
                     continue
                 
                 # Parse timestamp
@@ -237,54 +456,46 @@ class NewsMonitor:
                 except:
                     timestamp = datetime.now()
                 
-                impact = self._classify_impact(headline)
-                keywords = self._extract_keywords(headline)
-                
-                news_items.append(NewsItem(
+                results[symbol].append(NewsItem(
                     symbol=symbol,
                     headline=headline,
-                    source=item.get("site", "FMP"),
+                    source=sys.intern(item.get("site") or "FMP"),
                     timestamp=timestamp,
-                    url=item.get("url", ""),
-                    impact=impact,
-                    keywords=keywords
+                    timestamp_epoch=timestamp.timestamp(),
+                    url=item.get("url", "")
                 ))
-                
-                self._seen_news.add(news_id)
-                
-        except Exception as e:
-            logger.debug(f"FMP news error for {symbol}: {e}")
         
-        return news_items
+        return results
     
     # ==================== NEWS CLASSIFICATION ====================
     
-    def _classify_impact(self, headline: str) -> NewsImpact:
-        """Classify news impact as positive/negative/neutral."""
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _analyze_headline(cls, headline: str) -> Tuple[NewsImpact, Tuple[str, ...]]:
+        """
+        Classify impact (positive/negative/neutral) and extract material
+        keywords with a single keyword scan.
+        
+        Memoized: the same headline often shows up for several symbols and
+        sources, and classification only depends on the text.
+        """
         headline_lower = headline.lower()
+        matched = [kw for kw in cls._ALL_KEYWORDS if kw in headline_lower]
         
-        pos_count = sum(1 for kw in self.POSITIVE_KEYWORDS if kw in headline_lower)
-        neg_count = sum(1 for kw in self.NEGATIVE_KEYWORDS if kw in headline_lower)
+        pos_count = len(cls._POSITIVE_SET.intersection(matched))
+        neg_count = len(cls._NEGATIVE_SET.intersection(matched))
+        keywords = tuple(kw for kw in matched if kw in cls._MATERIAL_SET)
         
         if pos_count > neg_count and pos_count >= 1:
-            return NewsImpact.POSITIVE
+            impact = NewsImpact.POSITIVE
         elif neg_count > pos_count and neg_count >= 1:
-            return NewsImpact.NEGATIVE
+            impact = NewsImpact.NEGATIVE
         elif pos_count == neg_count and pos_count > 0:
-            return NewsImpact.NEUTRAL
+            impact = NewsImpact.NEUTRAL
         else:
-            return NewsImpact.UNKNOWN
-    
-    def _extract_keywords(self, headline: str) -> List[str]:
-        """Extract material keywords from headline."""
-        headline_lower = headline.lower()
-        found = []
+            impact = NewsImpact.UNKNOWN
         
-        for kw in self.MATERIAL_KEYWORDS:
-            if kw in headline_lower:
-                found.append(kw)
-        
-        return found
+        return impact, keywords
     
     def is_material_news(self, news: NewsItem) -> bool:
         """Check if news is material (could affect position)."""
@@ -304,9 +515,7 @@ class NewsMonitor:
         """Check all symbols in watchlist for news."""
         all_news = []
         
-        for symbol in list(self._watchlist):
-            news = self.check_news(symbol)
-            
+        for news in self.check_news_many(list(self._watchlist)).values():
             for item in news:
                 if self.is_material_news(item):
                     all_news.append(item)
@@ -335,7 +544,7 @@ class NewsMonitor:
             f"⏰ {news.timestamp.strftime('%H:%M')}"
         )
         
-        self.telegram.send(msg)
+        self.telegram.send_nowait(msg)
     
     def start_monitoring(self):
         """Start background news monitoring."""
@@ -355,32 +564,66 @@ class NewsMonitor:
         logger.info("News monitoring stopped")
     
     def _monitor_loop(self):
-        """Background monitoring loop."""
+        """
+        Background monitoring loop.
+        
+        Cycles are scheduled from their start time (monotonic clock), so a
+        slow check doesn't push every later check back.
+        """
+        next_tick = time.monotonic()
+        
         while self._running:
             try:
                 # Only check during market hours
                 if self._is_market_hours():
-                    self.check_watchlist()
-                
-                time.sleep(self.check_interval)
+                    interval = self._next_interval(self.check_watchlist())
+                else:
+                    self._empty_cycles = 0
+                    interval = self.check_interval
                 
             except Exception as e:
                 logger.error(f"News monitor error: {e}")
-                time.sleep(60)
+                interval = 60
+            
+            next_tick += interval
+            now = time.monotonic()
+            
+            # Fell more than a whole interval behind: don't burst to catch up
+            if next_tick < now - interval:
+                next_tick = now + interval
+            
+            time.sleep(max(0.0, next_tick - now))
+    
+    def _next_interval(self, material: List[NewsItem]) -> float:
+        """
+        Seconds until the next check: check_interval after material news
+        and around the open/close, otherwise doubling (up to
+        max_check_interval) for each quiet cycle in a row.
+        """
+        if material or self._is_busy_window():
+            self._empty_cycles = 0
+            return self.check_interval
+        
+        self._empty_cycles += 1
+        backoff = self.check_interval * 2 ** min(self._empty_cycles, 3)
+        return min(self.max_check_interval, backoff)
+    
+    def _is_busy_window(self) -> bool:
+        """First/last _BUSY_WINDOW_MIN minutes of the session, when news lands."""
+        now = datetime.now(ET)
+        minutes = now.hour * 60 + now.minute
+        return (_MARKET_OPEN_MIN <= minutes < _MARKET_OPEN_MIN + _BUSY_WINDOW_MIN
+                or _MARKET_CLOSE_MIN - _BUSY_WINDOW_MIN <= minutes < _MARKET_CLOSE_MIN)
     
     def _is_market_hours(self) -> bool:
         """Check if market is open."""
-        import pytz
-        ET = pytz.timezone('US/Eastern')
         now = datetime.now(ET)
         
         if now.weekday() >= 5:  # Weekend
             return False
         
-        market_open = now.replace(hour=9, minute=30, second=0)
-        market_close = now.replace(hour=16, minute=0, second=0)
-        
-        return market_open <= now <= market_close
+        minutes = now.hour * 60 + now.minute
+        return _MARKET_OPEN_MIN <= minutes < _MARKET_CLOSE_MIN
     
     # ==================== POSITION IMPACT CHECK ====================
     
@@ -396,10 +639,11 @@ class NewsMonitor:
             return None
         
         # Check for strongly negative news
+        now = time.time()
         for item in news:
             if item.impact == NewsImpact.NEGATIVE and self.is_material_news(item):
                 # Check if news is very recent (last 30 min)
-                age = (datetime.now() - item.timestamp).seconds / 60
+                age = (now - item.timestamp_epoch) / 60
                 
                 if age < 30:
                     return {
@@ -4,19 +4,23 @@ core/storage.py - Data Storage Manager
 Handles:
 - Weekly universe snapshots (MongoDB)
 - Earnings candidates (JSON for lightweight)
-- Analysis results
+- Analysis results (Parquet snapshots when pyarrow is installed)
 - Trade logs
 
 Principle: MongoDB for versioned weekly data, JSON for ephemeral data.
 """
 
+import atexit
 import json
 import logging
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 
 import config
+from core.jsonio import read_json, write_json
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,102 @@ except ImportError:
     MONGO_AVAILABLE = False
     logger.info("pymongo not installed, using file storage only")
 
+# Parquet for analysis snapshots (optional)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def _results_to_arrow(results: List[Dict]) -> "pa.Table":
+    """Build a table from result records (columns = union of their keys)."""
+    keys = list(dict.fromkeys(k for r in results for k in r))
+    return pa.table({k: [r.get(k) for r in results] for k in keys})
+
+
+def _write_analysis_file(data_dir: Path, data: Dict):
+    """
+    Write an analysis snapshot to disk.
+    
+    Parquet (snappy) when pyarrow is available; JSON otherwise, or if
+    the records don't fit a single column type.
+    """
+    week_id = data["week_id"]
+    parquet_path = data_dir / f"analysis_{week_id}.parquet"
+    if PARQUET_AVAILABLE:
+        try:
+            pq.write_table(
+                _results_to_arrow(data.get("results", [])),
+                parquet_path,
+                compression="snappy"
+            )
+            return
+        except (pa.ArrowException, OSError) as e:
+            logger.warning(f"Parquet write failed for {week_id}, using JSON: {e}")
+    
+    # Readers prefer Parquet, so an older one would shadow this JSON
+    parquet_path.unlink(missing_ok=True)
+    write_json(data_dir / f"analysis_{week_id}.json", data)
+
+
+def _read_analysis_file(data_dir: Path, week_id: str) -> Optional[List[Dict]]:
+    """Read analysis results from disk, preferring Parquet over legacy JSON."""
+    filepath = data_dir / f"analysis_{week_id}.parquet"
+    if PARQUET_AVAILABLE and filepath.exists():
+        try:
+            return pq.read_table(filepath).to_pylist()
+        except (pa.ArrowException, OSError) as e:
+            logger.error(f"Parquet read failed for {week_id}: {e}")
+    
+    filepath = data_dir / f"analysis_{week_id}.json"
+    if filepath.exists():
+        return read_json(filepath).get("results", [])
+    
+    return None
+
+
+def _normalize_symbols(records: List[Dict]):
+    """Upper-case the "symbol" of each record in place (readers rely on it)."""
+    for r in records:
+        symbol = r.get("symbol")
+        if isinstance(symbol, str):
+            r["symbol"] = symbol.upper()
+
+
+# Degraded-mode notice is logged once per process, not per Storage()
+_warned_no_mongo = False
+
+
+# Serializes appends to the JSONL logs across Storage instances/threads
+_append_lock = threading.Lock()
+
+
+def _append_jsonl(filepath: Path, record: Dict):
+    """Append one record as a line of JSON."""
+    line = json.dumps(record) + "\n"
+    with _append_lock, open(filepath, 'a') as f:
+        f.write(line)
+
+
+def _read_jsonl(filepath: Path) -> List[Dict]:
+    """Read all records from a JSONL file, skipping a torn last line."""
+    records = []
+    if not filepath.exists():
+        return records
+    
+    with open(filepath) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt line in {filepath.name}")
+    return records
+
 
 def get_week_id(date: datetime = None) -> str:
     """Get week identifier (e.g., '2026-W05')."""
@@ -49,11 +149,30 @@ class Storage:
     Uses MongoDB for weekly snapshots, JSON files for lightweight data.
     """
     
+    # Trades are inserted into MongoDB in batches of up to this many,
+    # at least every TRADE_FLUSH_SECONDS (the JSONL log is written at once)
+    TRADE_FLUSH_SIZE = 50
+    TRADE_FLUSH_SECONDS = 5
+    
+    # Weekly snapshots rarely change, so reads are cached in-process
+    UNIVERSE_CACHE_TTL = 3600
+    ANALYSIS_CACHE_TTL = 300
+    
     def __init__(self):
         self.data_dir = config.DATA_DIR
         self.mongo_client = None
         self.db = None
         
+        self._trade_queue: List[Dict] = []
+        self._trade_lock = threading.Lock()
+        self._trade_flusher: Optional[threading.Thread] = None
+        
+        # week_id -> (payload, monotonic expiry)
+        self._universe_cache: Dict[str, Tuple[Set[str], float]] = {}
+        self._analysis_cache: Dict[str, Tuple[List[Dict], float]] = {}
+        # week_id -> (results list it was built from, SYMBOL -> result)
+        self._analysis_index: Dict[str, Tuple[List[Dict], Dict[str, Dict]]] = {}
+        
         # Connect MongoDB if available
         if MONGO_AVAILABLE and config.MONGO_URI:
             try:
@@ -65,11 +184,39 @@ class Storage:
                 logger.warning(f"MongoDB connection failed: {e}")
                 self.mongo_client = None
                 self.db = None
+        
+        if self._has_mongo():
+            self._ensure_indexes()
+        else:
+            global _warned_no_mongo
+            if not _warned_no_mongo:
+                _warned_no_mongo = True
+                logger.info("MongoDB unavailable: weekly snapshots are stored as JSON only")
     
     def _has_mongo(self) -> bool:
         """Check if MongoDB is available."""
         return self.db is not None
     
+    def _ensure_indexes(self):
+        """Index the lookup keys (no-op if the indexes already exist)."""
+        try:
+            self.db.universe.create_index("week_id", unique=True)
+            self.db.analysis.create_index("week_id", unique=True)
+            self.db.trades.create_index([("timestamp", -1)])
+        except Exception as e:
+            logger.warning(f"MongoDB index creation failed: {e}")
+    
+    def invalidate_cache(self, week_id: str = None):
+        """Drop cached universe/analysis reads for a week (all weeks if None)."""
+        if week_id is None:
+            self._universe_cache.clear()
+            self._analysis_cache.clear()
+            self._analysis_index.clear()
+        else:
+            self._universe_cache.pop(week_id, None)
+            self._analysis_cache.pop(week_id, None)
+            self._analysis_index.pop(week_id, None)
+    
     # ==================== WEEKLY UNIVERSE ====================
     
     def save_universe(self, instruments: List[Dict], week_id: str = None) -> bool:
@@ -80,6 +227,8 @@ class Storage:
         Stored in MongoDB with version.
         """
         week_id = week_id or get_week_id()
+        self.invalidate_cache(week_id)
+        _normalize_symbols(instruments)
         
         data = {
             "week_id": week_id,
@@ -97,13 +246,12 @@ class Storage:
                     upsert=True
                 )
                 logger.info(f"Universe saved to MongoDB: {week_id} ({len(instruments)} instruments)")
+                return True
             except Exception as e:
                 logger.error(f"MongoDB save failed: {e}")
         
-        # Also save to JSON as backup
-        filepath = self.data_dir / f"universe_{week_id}.json"
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        # JSON when MongoDB is unavailable (export_backup snapshots otherwise)
+        write_json(self.data_dir / f"universe_{week_id}.json", data)
         
         return True
     
@@ -124,13 +272,26 @@ class Storage:
         # Fall back to JSON
         filepath = self.data_dir / f"universe_{week_id}.json"
         if filepath.exists():
-            with open(filepath) as f:
-                return json.load(f)
+            return read_json(filepath)
         
         return None
     
     def get_universe_symbols(self, week_id: str = None) -> List[str]:
         """Get list of symbols from universe."""
+        week_id = week_id or get_week_id()
+        
+        # Only fetch the symbol field from MongoDB
+        if self._has_mongo():
+            try:
+                data = self.db.universe.find_one(
+                    {"week_id": week_id},
+                    {"instruments.symbol": 1, "_id": 0}
+                )
+                if data:
+                    return [inst.get("symbol", "") for inst in data.get("instruments", [])]
+            except Exception as e:
+                logger.error(f"MongoDB read failed: {e}")
+        
         data = self.get_universe(week_id)
         if not data:
             return []
@@ -139,8 +300,17 @@ class Storage:
     
     def is_in_universe(self, symbol: str, week_id: str = None) -> bool:
         """Check if symbol is in current universe."""
-        symbols = self.get_universe_symbols(week_id)
-        return symbol.upper() in [s.upper() for s in symbols]
+        week_id = week_id or get_week_id()
+        
+        cached = self._universe_cache.get(week_id)
+        if cached and time.monotonic() < cached[1]:
+            return symbol.upper() in cached[0]
+        
+        # Symbols are upper-cased on save
+        symbols = set(self.get_universe_symbols(week_id))
+        if symbols:
+            self._universe_cache[week_id] = (symbols, time.monotonic() + self.UNIVERSE_CACHE_TTL)
+        return symbol.upper() in symbols
     
     # ==================== EARNINGS CANDIDATES ====================
     
@@ -159,9 +329,7 @@ class Storage:
             "candidates": candidates
         }
         
-        filepath = self.data_dir / f"earnings_{week_id}.json"
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(self.data_dir / f"earnings_{week_id}.json", data)
         
         logger.info(f"Earnings candidates saved: {week_id} ({len(candidates)})")
         return True
@@ -172,9 +340,7 @@ class Storage:
         
         filepath = self.data_dir / f"earnings_{week_id}.json"
         if filepath.exists():
-            with open(filepath) as f:
-                data = json.load(f)
-                return data.get("candidates", [])
+            return read_json(filepath).get("candidates", [])
         
         return []
     
@@ -187,6 +353,8 @@ class Storage:
         This is the precomputed data used during execution.
         """
         week_id = week_id or get_week_id()
+        self.invalidate_cache(week_id)
+        _normalize_symbols(results)
         
         data = {
             "week_id": week_id,
@@ -196,6 +364,7 @@ class Storage:
         }
         
         # Save to MongoDB for persistence
+        saved = False
         if self._has_mongo():
             try:
                 self.db.analysis.replace_one(
@@ -203,21 +372,61 @@ class Storage:
                     data,
                     upsert=True
                 )
+                saved = True
             except Exception as e:
                 logger.error(f"MongoDB save failed: {e}")
         
-        # Also save to JSON
-        filepath = self.data_dir / f"analysis_{week_id}.json"
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        # File when MongoDB is unavailable (export_backup snapshots otherwise)
+        if not saved:
+            _write_analysis_file(self.data_dir, data)
         
         logger.info(f"Analysis results saved: {week_id} ({len(results)})")
         return True
     
+    # ==================== BACKUP ====================
+    
+    def export_backup(self, week_id: str = None) -> bool:
+        """
+        Snapshot the week's MongoDB universe and analysis to JSON files.
+        
+        Saves skip the JSON copy while MongoDB is up, so this is run at the
+        end of the weekend pipeline and after its universe/analyze CLI steps.
+        """
+        week_id = week_id or get_week_id()
+        if not self._has_mongo():
+            return False
+        
+        for name, collection in (("universe", self.db.universe), ("analysis", self.db.analysis)):
+            try:
+                data = collection.find_one({"week_id": week_id}, {"_id": 0})
+                if not data:
+                    continue
+                if name == "analysis":
+                    _write_analysis_file(self.data_dir, data)
+                else:
+                    write_json(self.data_dir / f"{name}_{week_id}.json", data)
+            except Exception as e:
+                logger.error(f"Backup of {name} {week_id} failed: {e}")
+                return False
+        
+        logger.info(f"Backup exported: {week_id}")
+        return True
+    
     def get_analysis_results(self, week_id: str = None) -> List[Dict]:
         """Get analysis results for the week."""
         week_id = week_id or get_week_id()
         
+        cached = self._analysis_cache.get(week_id)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        
+        results = self._load_analysis_results(week_id)
+        if results:
+            self._analysis_cache[week_id] = (results, time.monotonic() + self.ANALYSIS_CACHE_TTL)
+        return results
+    
+    def _load_analysis_results(self, week_id: str) -> List[Dict]:
+        """Read analysis results from MongoDB, falling back to JSON."""
         # Try MongoDB first
         if self._has_mongo():
             try:
@@ -227,61 +436,92 @@ class Storage:
             except:
                 pass
         
-        # Fall back to JSON
-        filepath = self.data_dir / f"analysis_{week_id}.json"
-        if filepath.exists():
-            with open(filepath) as f:
-                data = json.load(f)
-                return data.get("results", [])
-        
-        return []
+        # Fall back to the file snapshot
+        return _read_analysis_file(self.data_dir, week_id) or []
     
     def get_analysis_for_symbol(self, symbol: str, week_id: str = None) -> Optional[Dict]:
         """Get precomputed analysis for a specific symbol."""
+        week_id = week_id or get_week_id()
+        
+        # Index the (cached) results once instead of scanning per lookup;
+        # rebuilt whenever get_analysis_results hands back a fresh list
         results = self.get_analysis_results(week_id)
-        for r in results:
-            if r.get("symbol", "").upper() == symbol.upper():
-                return r
-        return None
+        entry = self._analysis_index.get(week_id)
+        if entry is None or entry[0] is not results:
+            index = {}
+            for r in results:
+                index.setdefault(r.get("symbol", ""), r)
+            entry = (results, index)
+            if results:
+                self._analysis_index[week_id] = entry
+        
+        return entry[1].get(symbol.upper())
     
     # ==================== TRADES ====================
     
     def log_trade(self, trade: Dict) -> bool:
         """Log a trade."""
+        _normalize_symbols([trade])
         trade["timestamp"] = datetime.now().isoformat()
         
-        # Append to daily log file
+        # Append to daily log file (one JSON object per line)
         today = datetime.now().strftime("%Y-%m-%d")
-        filepath = self.data_dir / f"trades_{today}.json"
-        
-        trades = []
-        if filepath.exists():
-            with open(filepath) as f:
-                trades = json.load(f)
+        _append_jsonl(self.data_dir / f"trades_{today}.jsonl", trade)
         
-        trades.append(trade)
-        
-        with open(filepath, 'w') as f:
-            json.dump(trades, f, indent=2)
-        
-        # Also save to MongoDB
+        # Also save to MongoDB (batched)
         if self._has_mongo():
-            try:
-                self.db.trades.insert_one(trade.copy())
-            except:
-                pass
+            self._queue_trade(trade.copy())
         
         return True
     
+    def _queue_trade(self, trade: Dict):
+        """Queue a trade for the next MongoDB insert_many."""
+        with self._trade_lock:
+            self._trade_queue.append(trade)
+            full = len(self._trade_queue) >= self.TRADE_FLUSH_SIZE
+            
+            # Started on first use: most Storage instances never log trades
+            if self._trade_flusher is None:
+                self._trade_flusher = threading.Thread(
+                    target=self._trade_flush_loop, name="storage-trade-flush", daemon=True
+                )
+                self._trade_flusher.start()
+                atexit.register(self.flush_trades)
+        
+        if full:
+            self.flush_trades()
+    
+    def _trade_flush_loop(self):
+        """Background flush so queued trades reach MongoDB within seconds."""
+        while True:
+            time.sleep(self.TRADE_FLUSH_SECONDS)
+            self.flush_trades()
+    
+    def flush_trades(self):
+        """Insert all queued trades into MongoDB."""
+        with self._trade_lock:
+            batch, self._trade_queue = self._trade_queue, []
+        
+        if not batch:
+            return
+        
+        try:
+            self.db.trades.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.warning(f"MongoDB trade insert failed ({len(batch)} trades): {e}")
+    
     def get_trades(self, date: str = None) -> List[Dict]:
         """Get trades for a specific date."""
         date = date or datetime.now().strftime("%Y-%m-%d")
-        filepath = self.data_dir / f"trades_{date}.json"
         
-        if filepath.exists():
-            with open(filepath) as f:
-                return json.load(f)
-        return []
+        # Days logged before the JSONL switch are a single JSON list
+        trades = []
+        legacy = self.data_dir / f"trades_{date}.json"
+        if legacy.exists():
+            with open(legacy) as f:
+                trades = json.load(f)
+        
+        return trades + _read_jsonl(self.data_dir / f"trades_{date}.jsonl")
     
     # ==================== POSITIONS ====================
     
@@ -294,8 +534,7 @@ class Storage:
             "positions": positions
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(filepath, data, indent=2)
         
         return True
     
@@ -320,14 +559,4 @@ class Storage:
         }
         
         today = datetime.now().strftime("%Y-%m-%d")
-        filepath = self.data_dir / f"execution_log_{today}.json"
-        
-        logs = []
-        if filepath.exists():
-            with open(filepath) as f:
-                logs = json.load(f)
-        
-        logs.append(log_entry)
-        
-        with open(filepath, 'w') as f:
-            json.dump(logs, f, indent=2)
+        _append_jsonl(self.data_dir / f"execution_log_{today}.jsonl", log_entry)
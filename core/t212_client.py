@@ -9,18 +9,36 @@ Key limitations:
 """
 
 import base64
+import re
 import requests
 import logging
+import random
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
+from core.jsonio import read_json, write_json
 
 logger = logging.getLogger(__name__)
 
 
+# Valid US symbol:
+# - 1-5 characters, alphanumeric (with possible -)
+# - Doesn't start with a number (like 2MXP)
+# - At most one number (more looks like a weird derivative)
+_SYMBOL_RE = re.compile(r"(?![0-9])(?!(?:.*[0-9]){2})[A-Z0-9-]{1,5}")
+
+
+@lru_cache(maxsize=16384)
 def clean_symbol(symbol: str) -> str:
     """
     Clean stock symbol for yfinance compatibility.
@@ -46,26 +64,8 @@ def clean_symbol(symbol: str) -> str:
     # Uppercase
     symbol = symbol.upper()
     
-    # Filter out invalid symbols:
-    # - Must be 1-5 characters for US stocks
-    # - Must be alphanumeric (with possible -)
-    # - Skip if it has numbers at the start (like 2MXP)
-    # - Skip if it looks like a weird derivative (contains multiple numbers)
-    
-    if len(symbol) < 1 or len(symbol) > 5:
-        return ""
-    
-    # Skip if starts with number
-    if symbol[0].isdigit():
-        return ""
-    
-    # Skip if has more than one number (likely not a real stock)
-    digit_count = sum(1 for c in symbol if c.isdigit())
-    if digit_count > 1:
-        return ""
-    
-    # Must be alphanumeric or contain -
-    if not all(c.isalnum() or c == '-' for c in symbol):
+    # Filter out invalid symbols (see _SYMBOL_RE)
+    if not _SYMBOL_RE.fullmatch(symbol):
         return ""
     
     return symbol
@@ -95,7 +95,7 @@ def validate_symbol(symbol: str) -> bool:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class Instrument:
     ticker: str      # AAPL_US_EQ
     symbol: str      # AAPL
@@ -104,7 +104,7 @@ class Instrument:
     currency: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     ticker: str
     symbol: str
@@ -115,7 +115,7 @@ class Position:
     pnl_pct: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     id: str
     currency: str
@@ -125,24 +125,94 @@ class Account:
 
 
 class RateLimiter:
+    """
+    Token bucket per endpoint key.
+    
+    Spaced-out calls go straight through; only calls beyond the bucket's
+    capacity wait, for as long as the refill takes. Keys with a quota are
+    also held to T212's server-side window (max calls per sliding window).
+    """
+    
     def __init__(self):
-        self.last_calls = {}
+        # key -> (capacity, refill per second)
         self.limits = {
-            "account": 6, "instruments": 55, "positions": 2,
-            "orders": 6, "market_order": 2, "default": 2
+            "account": (1, 1 / 6), "instruments": (1, 1 / 55), "positions": (1, 1 / 2),
+            "orders": (1, 1 / 6), "market_order": (2, 1 / 2), "default": (1, 1 / 2)
         }
+        self.state: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, last refill)
+        
+        # key -> (max calls, window seconds), as published by T212
+        self.quotas = {"market_order": (50, 60)}
+        self.windows: Dict[str, deque] = {}  # key -> call times within the window
+        
+        self._lock = threading.Lock()
     
     def wait(self, key: str):
-        limit = self.limits.get(key, 2)
-        elapsed = time.time() - self.last_calls.get(key, 0)
-        if elapsed < limit:
-            time.sleep(limit - elapsed)
-        self.last_calls[key] = time.time()
+        capacity, rate = self.limits.get(key, self.limits["default"])
+        
+        # Take the token now (possibly going negative) so concurrent
+        # callers queue up behind each other, then sleep off the deficit
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self.state.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate) - 1
+            self.state[key] = (tokens, now)
+        
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+        
+        quota = self.quotas.get(key)
+        if quota:
+            self._wait_window(key, *quota)
+    
+    def _wait_window(self, key: str, max_calls: int, window: float):
+        """Block until the call fits in the sliding window, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                calls = self.windows.setdefault(key, deque())
+                while calls and calls[0] <= now - window:
+                    calls.popleft()
+                
+                if len(calls) < max_calls:
+                    calls.append(now)
+                    return
+                
+                wait = window - (now - calls[0])
+            
+            time.sleep(wait)
+
+
+def _retry_delay(resp: requests.Response, default: float = 60.0) -> float:
+    """Seconds to wait after a 429, from Retry-After or x-ratelimit-reset."""
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    
+    # T212 sends the Unix time the window resets at
+    reset = resp.headers.get("x-ratelimit-reset")
+    if reset:
+        try:
+            reset = float(reset)
+            return max(0.0, reset - time.time() if reset > 1e9 else reset)
+        except ValueError:
+            pass
+    
+    return default
 
 
 class T212Client:
     """Trading212 API Client."""
     
+    # Seconds a positions response is reused (the endpoint's rate limit)
+    POSITIONS_TTL = 2.0
+    
+    # The instrument catalogue rarely changes; reuse the on-disk copy this long
+    INSTRUMENTS_TTL = 7 * 86400
+    
     def __init__(self, paper: bool = True):
         if not config.T212_API_KEY or not config.T212_API_SECRET:
             raise ValueError("T212_API_KEY and T212_API_SECRET required")
@@ -159,9 +229,19 @@ class T212Client:
             "Authorization": f"Basic {auth}",
             "Content-Type": "application/json"
         })
+        # Room for concurrent calls (snapshot, threaded strategies); retries
+        # stay in _request, which knows about 429s and order safety
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2, pool_maxsize=32, max_retries=Retry(total=0)
+        ))
         
         self.rate_limiter = RateLimiter()
         self._instruments: Dict[str, Instrument] = {}
+        self._instruments_file = config.DATA_DIR / f"t212_instruments_{env}.json"
+        self._ticker_cache: Dict[str, Optional[str]] = {}  # raw symbol -> ticker
+        
+        # (fetched at, positions, {symbol: position}); cleared by orders
+        self._positions_cache: Optional[Tuple[float, List[Position], Dict[str, Position]]] = None
         
         logger.info(f"T212 client initialized ({env})")
     
@@ -174,7 +254,7 @@ class T212Client:
             try:
                 resp = self.session.request(
                     method, f"{self.base_url}{endpoint}",
-                    params=params, json=data, timeout=30
+                    params=params, json=data, timeout=(5, 30)
                 )
                 
                 if resp.status_code in [200, 201]:
@@ -182,22 +262,29 @@ class T212Client:
                 elif resp.status_code == 204:
                     return {"ok": True}
                 elif resp.status_code == 429:
-                    time.sleep(60)
+                    delay = _retry_delay(resp)
+                    logger.warning(f"Rate limited on {endpoint}, retrying in {delay:.1f}s")
+                    time.sleep(delay + random.uniform(0, 0.25))
                     continue
                 elif resp.status_code == 401:
                     raise ValueError("Auth failed")
                 else:
                     logger.error(f"API error {resp.status_code}: {resp.text}")
                     if attempt < 2:
-                        time.sleep(5)
+                        time.sleep(self._backoff(attempt))
                         continue
                     return None
             except requests.RequestException as e:
                 logger.error(f"Request failed: {e}")
                 if attempt < 2:
-                    time.sleep(5)
+                    time.sleep(self._backoff(attempt))
         return None
     
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with jitter for errors other than 429."""
+        return min(30, 2 ** attempt + random.random())
+    
     # === Account ===
     def get_account(self) -> Optional[Account]:
         """Get account info."""
@@ -221,43 +308,82 @@ class T212Client:
     
     # === Instruments ===
     def get_all_instruments(self, refresh: bool = False) -> List[Instrument]:
-        """Get ALL tradeable instruments."""
+        """Get ALL tradeable instruments (disk copy reused for INSTRUMENTS_TTL)."""
         if self._instruments and not refresh:
             return list(self._instruments.values())
         
+        if not refresh:
+            instruments = self._load_instruments_file()
+            if instruments is not None:
+                self._index_instruments(instruments)
+                logger.info(f"Loaded {len(instruments)} instruments from cache")
+                return instruments
+        
         logger.info("Fetching all T212 instruments...")
         data = self._request("GET", "/equity/metadata/instruments", "instruments")
         
         if not data:
             return []
         
-        self._instruments = {}
-        instruments = []
-        
-        for item in data:
-            ticker = item.get("ticker", "")
-            symbol = clean_symbol(ticker.split("_")[0])
-            
-            if not symbol:
-                continue
-            
-            inst = Instrument(
+        instruments = [
+            Instrument(
                 ticker=ticker,
                 symbol=symbol,
                 name=item.get("name", ""),
                 type=item.get("type", ""),
                 currency=item.get("currencyCode", "")
             )
-            instruments.append(inst)
-            self._instruments[ticker] = inst
-            self._instruments[symbol] = inst
+            for item in data
+            for ticker in (item.get("ticker", ""),)
+            if (symbol := clean_symbol(ticker.split("_")[0]))
+        ]
         
+        self._index_instruments(instruments)
         logger.info(f"Loaded {len(instruments)} instruments")
+        self._save_instruments_file(instruments)
         return instruments
     
+    def _index_instruments(self, instruments: List[Instrument]):
+        """Make instruments findable by T212 ticker and by clean symbol."""
+        self._ticker_cache = {}
+        self._instruments = dict(chain.from_iterable(
+            ((inst.ticker, inst), (inst.symbol, inst)) for inst in instruments
+        ))
+    
+    def _load_instruments_file(self) -> Optional[List[Instrument]]:
+        """Instruments saved by an earlier run, if younger than INSTRUMENTS_TTL."""
+        path = self._instruments_file
+        try:
+            if time.time() - path.stat().st_mtime >= self.INSTRUMENTS_TTL:
+                return None
+            return [Instrument(**d) for d in read_json(path)]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Could not read cached instruments: {e}")
+            return None
+    
+    def _save_instruments_file(self, instruments: List[Instrument]):
+        """Write the catalogue atomically, so readers never see a partial file."""
+        try:
+            write_json(self._instruments_file, [asdict(i) for i in instruments])
+        except Exception as e:
+            logger.debug(f"Could not cache instruments: {e}")
+    
     def get_ticker(self, symbol: str) -> Optional[str]:
-        """Get T212 ticker for symbol."""
-        symbol = clean_symbol(symbol)
+        """Get T212 ticker for symbol (memoised until instruments are reloaded)."""
+        try:
+            return self._ticker_cache[symbol]
+        except KeyError:
+            pass
+        
+        ticker = self._lookup_ticker(clean_symbol(symbol))
+        if self._instruments:
+            self._ticker_cache[symbol] = ticker
+        return ticker
+    
+    def _lookup_ticker(self, symbol: str) -> Optional[str]:
+        """Resolve a clean symbol against the instrument table."""
         if not self._instruments:
             self.get_all_instruments()
         
@@ -275,13 +401,31 @@ class T212Client:
     
     # === Positions ===
     def get_positions(self) -> List[Position]:
-        """Get open positions."""
+        """Get open positions (reused for POSITIONS_TTL seconds)."""
+        return list(self._get_positions_cached()[1])
+    
+    def _get_positions_cached(self) -> Tuple[float, List[Position], Dict[str, Position]]:
+        """Positions response plus a by-symbol index, fetched at most once per TTL."""
+        cached = self._positions_cache
+        if cached and time.monotonic() - cached[0] < self.POSITIONS_TTL:
+            return cached
+        
+        positions = self._fetch_positions()
+        if positions is None:
+            return (0.0, [], {})
+        
+        cached = (time.monotonic(), positions, {p.symbol: p for p in positions})
+        self._positions_cache = cached
+        return cached
+    
+    def _fetch_positions(self) -> Optional[List[Position]]:
+        """Fetch open positions; None if the request failed."""
         data = self._request("GET", "/equity/positions", "positions")
-        if not data:
-            return []
+        if data is None:
+            return None
         
         positions = []
-        for item in data:
+        for item in data or []:
             ticker = item.get("ticker", "")
             positions.append(Position(
                 ticker=ticker,
@@ -296,11 +440,7 @@ class T212Client:
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for symbol."""
-        symbol = clean_symbol(symbol)
-        for pos in self.get_positions():
-            if pos.symbol == symbol:
-                return pos
-        return None
+        return self._get_positions_cached()[2].get(clean_symbol(symbol))
     
     # === Orders ===
     def buy(self, symbol: str, quantity: float) -> Optional[Dict]:
@@ -317,8 +457,13 @@ class T212Client:
             logger.error(f"Quantity too small: {quantity}")
             return None
         
-        return self._request("POST", "/equity/orders/market", "market_order",
-                           data={"ticker": ticker, "quantity": quantity})
+        try:
+            return self._request("POST", "/equity/orders/market", "market_order",
+                               data={"ticker": ticker, "quantity": quantity})
+        finally:
+            # After the order, so a concurrent get_positions can't re-cache
+            # the pre-order holdings
+            self._positions_cache = None
     
     def sell(self, symbol: str, quantity: float) -> Optional[Dict]:
         """Place sell order (negative quantity)."""
@@ -333,8 +478,13 @@ class T212Client:
             logger.error(f"Quantity too small: {quantity}")
             return None
         
-        return self._request("POST", "/equity/orders/market", "market_order",
-                           data={"ticker": ticker, "quantity": -quantity})
+        try:
+            return self._request("POST", "/equity/orders/market", "market_order",
+                               data={"ticker": ticker, "quantity": -quantity})
+        finally:
+            # After the order, so a concurrent get_positions can't re-cache
+            # the pre-order holdings
+            self._positions_cache = None
     
     def close_position(self, symbol: str) -> Optional[Dict]:
         """Close entire position."""
@@ -343,6 +493,21 @@ class T212Client:
             return None
         return self.sell(symbol, pos.quantity)
     
+    # === Snapshot ===
+    def snapshot(self, instruments: bool = False) -> Tuple[Optional[Account], List[Position], List[Instrument]]:
+        """
+        Account, positions and (optionally) instruments in one go.
+        
+        The requests run concurrently, so this takes as long as the
+        slowest call instead of their sum; each still waits on its own
+        rate-limit bucket.
+        """
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            account = pool.submit(self.get_account)
+            positions = pool.submit(self.get_positions)
+            catalogue = pool.submit(self.get_all_instruments) if instruments else None
+            return account.result(), positions.result(), catalogue.result() if catalogue else []
+    
     # === Test ===
     def test_connection(self) -> bool:
         """Test API connection."""
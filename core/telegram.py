@@ -9,24 +9,60 @@ Sends structured alerts for:
 - Errors
 """
 
+import atexit
+import queue
 import requests
 import logging
+import threading
+import time
 from typing import List, Dict, Optional
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# Emoji lookups: score indexed by int(score) clamped to 0-5, P&L by (pnl >= 0)
+_SCORE_EMOJI = ("🔴", "🔴", "🔴", "🟡", "🟢", "🟢")
+_PNL_COLOR = ("🔴", "🟢")
+_PNL_TREND = ("📉", "📈")
+_TIME_EMOJI = {"bmo": "🌅", "amc": "🌙"}
+
 
 class Telegram:
     """Telegram notification system."""
     
+    # Seconds allowed at exit for queued alerts to go out
+    DRAIN_TIMEOUT = 10
+    
+    # Batchable alerts arriving within this window go out as one message,
+    # kept under Telegram's 4096-char limit
+    COALESCE_SECONDS = 0.5
+    COALESCE_MAX_CHARS = 3500
+    
     def __init__(self):
         self.token = config.TELEGRAM_TOKEN
         self.chat_id = config.TELEGRAM_CHAT_ID
         self.enabled = bool(self.token and self.chat_id)
         
+        # Fixed parts of every sendMessage call
+        self._url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        self._base_payload = {"chat_id": self.chat_id, "parse_mode": "HTML"}
+        
+        # Keep-alive session: one TLS handshake instead of one per alert.
+        # POST is retried on 429 (honouring Retry-After) and 5xx.
+        self.session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"POST"}))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+        
+        # Alerts queued by send_nowait, posted in order by a background thread
+        self._outbox: queue.Queue = queue.Queue()
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+        
         if not self.enabled:
             logger.warning("Telegram not configured")
     
@@ -36,14 +72,9 @@ class Telegram:
             return False
         
         try:
-            resp = requests.post(
-                f"https://api.telegram.org/bot{self.token}/sendMessage",
-                json={
-                    "chat_id": self.chat_id,
-                    "text": message,
-                    "parse_mode": "HTML",
-                    "disable_notification": silent
-                },
+            resp = self.session.post(
+                self._url,
+                json={**self._base_payload, "text": message, "disable_notification": silent},
                 timeout=10
             )
             return resp.status_code == 200
@@ -51,6 +82,71 @@ class Telegram:
             logger.error(f"Telegram error: {e}")
             return False
     
+    def send_nowait(self, message: str, silent: bool = False, batchable: bool = False):
+        """
+        Queue a message; the caller doesn't wait for the round trip.
+        
+        Batchable messages may be merged with others queued right after
+        them (same silent flag) into a single sendMessage.
+        """
+        if not self.enabled:
+            return
+        
+        with self._sender_lock:
+            if self._sender is None:
+                self._sender = threading.Thread(
+                    target=self._send_loop, name="telegram-sender", daemon=True
+                )
+                self._sender.start()
+                atexit.register(self.flush)
+        
+        self._outbox.put((message, silent, batchable))
+    
+    def _send_loop(self):
+        """Post queued messages in order, merging runs of batchable ones."""
+        held = None  # taken off the queue but not mergeable into the last batch
+        while True:
+            message, silent, batchable = held or self._outbox.get()
+            held = None
+            parts, size = [message], len(message)
+            
+            if batchable:
+                deadline = time.monotonic() + self.COALESCE_SECONDS
+                while True:
+                    try:
+                        nxt = self._outbox.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if nxt[2] and nxt[1] == silent and size + 2 + len(nxt[0]) <= self.COALESCE_MAX_CHARS:
+                        parts.append(nxt[0])
+                        size += 2 + len(nxt[0])
+                    else:
+                        held = nxt
+                        break
+            
+            try:
+                self.send("\n\n".join(parts), silent)
+            finally:
+                for _ in parts:
+                    self._outbox.task_done()
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Wait for queued messages to be sent; False if timed out."""
+        deadline = time.monotonic() + (self.DRAIN_TIMEOUT if timeout is None else timeout)
+        with self._outbox.all_tasks_done:
+            while self._outbox.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Telegram: {self._outbox.unfinished_tasks} message(s) not sent")
+                    return False
+                self._outbox.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self):
+        """Send what's queued and release pooled connections."""
+        self.flush()
+        self.session.close()
+    
     # === Structured Messages ===
     
     def universe_update(self, count: int, week_start: str):
@@ -63,45 +159,43 @@ class Telegram:
             f"━━━━━━━━━━━━━━━━━━━━\n"
             f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         )
-        self.send(msg)
+        self.send_nowait(msg)
     
     def earnings_candidates(self, candidates: List[Dict], week_start: str):
         """Earnings candidates for the week."""
-        msg = (
-            f"📅 <b>Earnings Candidates</b>\n"
-            f"Week: {week_start}\n"
-            f"━━━━━━━━━━━━━━━━━━━━\n"
-        )
+        # Lines joined once at the end (no quadratic += on a growing str)
+        lines = [
+            "📅 <b>Earnings Candidates</b>",
+            f"Week: {week_start}",
+            "━━━━━━━━━━━━━━━━━━━━",
+        ]
         
         if not candidates:
-            msg += "No candidates this week.\n"
+            lines.append("No candidates this week.")
         else:
             # Group by day
             by_day = {}
             for c in candidates:
-                day = c.get("date", "Unknown")
-                if day not in by_day:
-                    by_day[day] = []
-                by_day[day].append(c)
+                by_day.setdefault(c.get("date", "Unknown"), []).append(c)
             
             for day, items in sorted(by_day.items()):
-                msg += f"\n<b>{day}</b>\n"
+                lines.append("")
+                lines.append(f"<b>{day}</b>")
                 for item in items[:10]:  # Max 10 per day
                     symbol = item.get("symbol", "?")
-                    time_str = item.get("time", "")
-                    time_emoji = "🌅" if time_str == "bmo" else "🌙" if time_str == "amc" else "❓"
-                    msg += f"  {time_emoji} {symbol}\n"
+                    time_emoji = _TIME_EMOJI.get(item.get("time", ""), "❓")
+                    lines.append(f"  {time_emoji} {symbol}")
         
-        msg += f"\n━━━━━━━━━━━━━━━━━━━━\nTotal: {len(candidates)}"
-        self.send(msg)
+        lines += ["", "━━━━━━━━━━━━━━━━━━━━", f"Total: {len(candidates)}"]
+        self.send_nowait("\n".join(lines))
     
     def analysis_results(self, results: List[Dict], week_start: str):
         """Analysis results for earnings candidates."""
-        msg = (
-            f"🔬 <b>Analysis Complete</b>\n"
-            f"Week: {week_start}\n"
-            f"━━━━━━━━━━━━━━━━━━━━\n"
-        )
+        lines = [
+            "🔬 <b>Analysis Complete</b>",
+            f"Week: {week_start}",
+            "━━━━━━━━━━━━━━━━━━━━",
+        ]
         
         # Sort by score descending
         sorted_results = sorted(results, key=lambda x: x.get("final_score", 0), reverse=True)
@@ -111,18 +205,11 @@ class Telegram:
             score = r.get("final_score", 0)
             behavior = r.get("gap_behavior", "?")
             
-            # Score emoji
-            if score >= 4:
-                emoji = "🟢"
-            elif score >= 3:
-                emoji = "🟡"
-            else:
-                emoji = "🔴"
-            
-            msg += f"{emoji} <b>{symbol}</b>: {score}/5 ({behavior})\n"
+            emoji = _SCORE_EMOJI[min(max(int(score), 0), 5)]
+            lines.append(f"{emoji} <b>{symbol}</b>: {score}/5 ({behavior})")
         
-        msg += f"\n━━━━━━━━━━━━━━━━━━━━\nAnalyzed: {len(results)}"
-        self.send(msg)
+        lines += ["", "━━━━━━━━━━━━━━━━━━━━", f"Analyzed: {len(results)}"]
+        self.send_nowait("\n".join(lines))
     
     def trade_entry(self, symbol: str, price: float, quantity: float, 
                     score: int, reason: str):
@@ -137,13 +224,12 @@ class Telegram:
             f"━━━━━━━━━━━━━━━━━━━━\n"
             f"⏰ {datetime.now().strftime('%H:%M:%S')}"
         )
-        self.send(msg)
+        self.send_nowait(msg, batchable=True)
     
     def trade_exit(self, symbol: str, entry: float, exit_price: float,
                    pnl: float, pnl_pct: float, reason: str):
         """Trade exit alert."""
-        emoji = "📈" if pnl >= 0 else "📉"
-        pnl_color = "🟢" if pnl >= 0 else "🔴"
+        pnl_color = _PNL_COLOR[pnl >= 0]
         
         msg = (
             f"🔴 <b>SELL {symbol}</b>\n"
@@ -155,21 +241,21 @@ class Telegram:
             f"━━━━━━━━━━━━━━━━━━━━\n"
             f"⏰ {datetime.now().strftime('%H:%M:%S')}"
         )
-        self.send(msg)
+        self.send_nowait(msg, batchable=True)
     
     def no_trade(self, symbol: str, reason: str):
         """Trade skipped alert."""
         msg = f"⏭️ <b>SKIP {symbol}</b>\nReason: {reason}"
-        self.send(msg, silent=True)
+        self.send_nowait(msg, silent=True, batchable=True)
     
     def error(self, context: str, message: str):
         """Error alert."""
         msg = f"⚠️ <b>ERROR</b>\nContext: {context}\nMessage: {message[:200]}"
-        self.send(msg)
+        self.send_nowait(msg)
     
     def daily_summary(self, pnl: float, trades: int, positions: int):
         """Daily summary."""
-        emoji = "📈" if pnl >= 0 else "📉"
+        emoji = _PNL_TREND[pnl >= 0]
         msg = (
             f"{emoji} <b>Daily Summary</b>\n"
             f"━━━━━━━━━━━━━━━━━━━━\n"
@@ -179,4 +265,4 @@ class Telegram:
             f"━━━━━━━━━━━━━━━━━━━━\n"
             f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         )
-        self.send(msg)
+        self.send_nowait(msg)
@@ -245,8 +245,7 @@ class TelegramBot:
     def _cmd_status(self, args):
         """Show bot status."""
         try:
-            account = self.t212.get_account()
-            positions = self.t212.get_positions()
+            account, positions, _ = self.t212.snapshot()
             trades = self.storage.get_trades()
             
             # Calculate P&L
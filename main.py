@@ -67,6 +67,7 @@ from datetime import datetime, time as dt_time
 import pytz
 
 import config
+from core import market_data
 from core.t212_client import T212Client
 from core.storage import Storage
 from core.telegram import Telegram
@@ -273,6 +274,10 @@ def main():
     
     paper = not args.live
     
+    # Bot and weekend runs fetch market data; load yfinance meanwhile
+    if not (args.status or args.positions):
+        market_data.prewarm()
+    
     if args.status:
         t212 = T212Client(paper=paper)
         if t212.test_connection():
@@ -11,9 +11,12 @@ from datetime import datetime, time
 from typing import List, Dict, Tuple, Optional
 from enum import Enum
 import logging
+import pytz
 
 logger = logging.getLogger(__name__)
 
+ET = pytz.timezone('US/Eastern')
+
 
 class SignalType(Enum):
     BUY = "BUY"
@@ -183,10 +186,6 @@ class BaseStrategy(ABC):
     
     def should_run_now(self) -> bool:
         """Check if it's time to run the daily scan."""
-        from datetime import datetime
-        import pytz
-        
-        ET = pytz.timezone('US/Eastern')
         now = datetime.now(ET)
         
         # Check if within 5 minutes of check_time
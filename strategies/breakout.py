@@ -118,9 +118,12 @@ class BreakoutStrategy(BaseStrategy):
         
         results = []
         
-        for symbol in self.get_universe():
+        universe = self.get_universe()
+        histories = market_data.get_history_batch(universe, period="1y", cached=True)
+        
+        for symbol in universe:
             try:
-                data = self._analyze_stock(symbol)
+                data = self._analyze_stock(symbol, histories.get(clean_symbol(symbol)))
                 if data:
                     results.append(data)
             except Exception as e:
@@ -141,13 +144,14 @@ class BreakoutStrategy(BaseStrategy):
         
         return results
     
-    def _analyze_stock(self, symbol: str) -> Optional[Dict]:
+    def _analyze_stock(self, symbol: str, hist: Optional[pd.DataFrame] = None) -> Optional[Dict]:
         """Analyze stock for breakout potential."""
         symbol = clean_symbol(symbol)
         if not symbol:
             return None
         
-        hist = market_data.get_history(symbol, period="1y")
+        if hist is None:
+            hist = market_data.get_history(symbol, period="1y", cached=True)
         if hist is None or len(hist) < 200:
             return None
         
@@ -18,6 +18,7 @@ from typing import List, Dict, Tuple, Optional
 
 import numpy as np
 import pandas as pd
+import pytz
 
 import config
 from core import market_data
@@ -29,6 +30,8 @@ from strategies.base_strategy import (
 
 logger = logging.getLogger(__name__)
 
+ET = pytz.timezone('US/Eastern')
+
 
 # Quality stocks for gap fading
 GAP_FADE_UNIVERSE = [
@@ -101,8 +104,11 @@ class GapFadeStrategy(BaseStrategy):
         
         results = []
         
-        for symbol in self.get_universe():
-            data = self._analyze_gap_history(symbol)
+        universe = self.get_universe()
+        histories = market_data.get_history_batch(universe, period="3mo", cached=True)
+        
+        for symbol in universe:
+            data = self._analyze_gap_history(symbol, histories.get(clean_symbol(symbol)))
             if data:
                 results.append(data)
         
@@ -112,13 +118,14 @@ class GapFadeStrategy(BaseStrategy):
         
         return results
     
-    def _analyze_gap_history(self, symbol: str) -> Optional[Dict]:
+    def _analyze_gap_history(self, symbol: str, hist: Optional[pd.DataFrame] = None) -> Optional[Dict]:
         """Analyze historical gap fill behavior."""
         symbol = clean_symbol(symbol)
         if not symbol:
             return None
         
-        hist = market_data.get_history(symbol, period="3mo")
+        if hist is None:
+            hist = market_data.get_history(symbol, period="3mo", cached=True)
         if hist is None or len(hist) < 50:
             return None
         
@@ -339,8 +346,6 @@ class GapFadeStrategy(BaseStrategy):
             return True, f"Target reached (gap fill)"
         
         # End of day exit
-        import pytz
-        ET = pytz.timezone('US/Eastern')
         now = datetime.now(ET)
         if now.hour >= 15 and now.minute >= 45:
             return True, "End of day exit"
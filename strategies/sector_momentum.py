@@ -103,9 +103,12 @@ class SectorMomentumStrategy(BaseStrategy):
         results = []
         sector_data = {}
         
-        # Fetch data for all sectors
+        # Fetch data for all sectors (and the benchmark) in one batch
+        histories = market_data.get_history_batch(
+            [*SECTOR_ETFS, BENCHMARK], period="3mo", cached=True
+        )
         for symbol, sector_name in SECTOR_ETFS.items():
-            data = self._fetch_sector_data(symbol)
+            data = self._fetch_sector_data(symbol, histories.get(symbol))
             if data:
                 sector_data[symbol] = data
                 sector_data[symbol]["sector_name"] = sector_name
@@ -115,7 +118,7 @@ class SectorMomentumStrategy(BaseStrategy):
             return []
         
         # Fetch benchmark
-        spy_data = self._fetch_sector_data(BENCHMARK)
+        spy_data = self._fetch_sector_data(BENCHMARK, histories.get(BENCHMARK))
         if not spy_data:
             logger.error("Could not fetch SPY data")
             return []
@@ -166,9 +169,10 @@ class SectorMomentumStrategy(BaseStrategy):
         
         return results
     
-    def _fetch_sector_data(self, symbol: str) -> Optional[Dict]:
-        """Fetch and calculate metrics for a sector ETF."""
-        hist = market_data.get_history(symbol, period="3mo")
+    def _fetch_sector_data(self, symbol: str, hist: Optional[pd.DataFrame] = None) -> Optional[Dict]:
+        """Fetch (unless given) and calculate metrics for a sector ETF."""
+        if hist is None:
+            hist = market_data.get_history(symbol, period="3mo", cached=True)
         
         if hist is None or len(hist) < 50:
             logger.warning(f"Insufficient data for {symbol}")